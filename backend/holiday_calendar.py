@@ -0,0 +1,139 @@
+"""
+공휴일 달력 캐시
+연 단위로 특일 정보를 미리 받아 로컬 JSON 파일에 저장해 두고, 날짜별 휴일 여부를 O(1)로 조회한다.
+API를 쓸 수 없거나 아직 받지 못한 연도는 주말만 휴일로 본다.
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional
+
+# 연도 -> 'YYYYMMDD' 공휴일 목록 (실패 시 None)
+HolidayFetcher = Callable[[int], Awaitable[Optional[List[str]]]]
+
+
+class HolidayCalendar:
+    def __init__(self, fetch_year: HolidayFetcher, cache_path: Path,
+                 refresh_interval: float = 86400, retry_interval: float = 600):
+        self._fetch_year = fetch_year
+        self.cache_path = cache_path
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+
+        self.holidays: Dict[int, FrozenSet[str]] = {}
+        self.fetched_at: Dict[int, float] = {}      # epoch 초
+        self.failure_count = 0
+        self.last_error: Optional[str] = None
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self._next_attempt: Dict[int, float] = {}   # 실패 후 재시도 가능 시각 (time.monotonic)
+        self._loop_task: Optional[asyncio.Task] = None
+        self.load()
+
+    def load(self):
+        """저장된 달력 파일 읽기 (없거나 깨져 있으면 무시)"""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for year, entry in data.get('years', {}).items():
+                self.holidays[int(year)] = frozenset(entry.get('dates', []))
+                self.fetched_at[int(year)] = entry.get('fetched_at', 0)
+        except (ValueError, OSError) as e:
+            print(f"Holiday cache load failed: {e}")
+
+    def save(self):
+        data = {
+            'years': {
+                str(year): {'dates': sorted(dates), 'fetched_at': self.fetched_at.get(year, 0)}
+                for year, dates in sorted(self.holidays.items())
+            }
+        }
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Holiday cache save failed: {e}")
+
+    def is_holiday(self, day: date) -> bool:
+        """주말이거나 공휴일이면 True (받지 않은 연도는 백그라운드로 받아 둠)"""
+        if day.weekday() >= 5:
+            return True
+        dates = self.holidays.get(day.year)
+        if dates is None:
+            self.trigger_fetch(day.year)
+            return False
+        return day.strftime('%Y%m%d') in dates
+
+    def trigger_fetch(self, year: int):
+        task = self._inflight.get(year)
+        if task is not None and not task.done():
+            return
+        if time.monotonic() < self._next_attempt.get(year, 0):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._inflight[year] = asyncio.create_task(self._fetch(year))
+
+    async def _fetch(self, year: int) -> bool:
+        try:
+            dates = await self._fetch_year(year)
+            error = None if dates is not None else "no data"
+        except Exception as e:
+            dates, error = None, f"{type(e).__name__}: {e}"
+
+        if dates is None:
+            self.failure_count += 1
+            self.last_error = error
+            print(f"Holiday fetch failed ({year}): {error}")
+            self._next_attempt[year] = time.monotonic() + self.retry_interval
+            return False
+        self.holidays[year] = frozenset(dates)
+        self.fetched_at[year] = time.time()
+        self.save()
+        return True
+
+    async def prefetch(self, years: List[int], force: bool = False):
+        """지정 연도 중 없거나 오래된 것만 받아서 저장"""
+        now = time.time()
+        targets = [y for y in years if force or now - self.fetched_at.get(y, 0) > self.refresh_interval]
+        for year in targets:
+            self.trigger_fetch(year)
+        tasks = [self._inflight[y] for y in targets if y in self._inflight]
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _run(self):
+        while True:
+            this_year = date.today().year
+            await self.prefetch([this_year, this_year + 1])
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._loop_task and not self._loop_task.done():
+            self._loop_task.cancel()
+        self._loop_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "years": {
+                str(year): {
+                    "holidays": len(dates),
+                    "fetched_at": datetime.fromtimestamp(self.fetched_at.get(year, 0), timezone.utc).isoformat(),
+                }
+                for year, dates in sorted(self.holidays.items())
+            },
+            "failure_count": self.failure_count,
+            "last_error": self.last_error,
+        }
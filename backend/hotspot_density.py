@@ -0,0 +1,169 @@
+"""
+불법주정차 단속 밀도 격자 (핫스팟)
+- 천안시 범위를 약 110m 간격 격자로 나누고, 동/읍/면별 단속 건수를 가우시안 커널로 퍼뜨린 밀도를 저장
+- 단속 CSV에는 좌표가 없으므로 각 동의 위치는 대표 좌표(DONG_COORDS) 또는 주차장 좌표 평균으로 잡는다
+- 결과는 .npy(밀도, 최댓값 1로 정규화) + .json(격자 범위/설정)으로 저장하고, 백엔드는 mmap으로 읽어 O(1)로 조회
+"""
+import json
+import math
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent
+DENSITY_NPY = BACKEND_DIR / "hotspot_density.npy"
+DENSITY_META_JSON = BACKEND_DIR / "hotspot_density.json"
+
+# 격자 범위 (천안시 전체 + 여유)
+MIN_LAT, MAX_LAT = 36.60, 37.00
+MIN_LON, MAX_LON = 126.95, 127.40
+CELL_LAT = 0.001    # 약 111m
+CELL_LON = 0.00125  # 위도 36.8도에서 약 111m
+BANDWIDTH_KM = 0.6  # 가우시안 커널 표준편차
+
+# 천안시 주요 동별 대표 좌표 (불법주정차 단속 데이터 기반)
+DONG_COORDS = {
+    '성정동': (36.820, 127.139),
+    '불당동': (36.811, 127.109),
+    '두정동': (36.832, 127.139),
+    '백석동': (36.835, 127.155),
+    '성성동': (36.839, 127.117),
+    '신부동': (36.818, 127.158),
+    '쌍용동': (36.800, 127.123),
+    '차암동': (36.810, 127.145),
+    '신방동': (36.786, 127.122),
+    '직산읍': (36.879, 127.150),
+}
+
+
+def extract_dong_from_address(address: str) -> str:
+    """주소에서 동/읍/면 이름 추출 (없으면 빈 문자열), 예측 엔진도 이 함수를 사용"""
+    if not address:
+        return ""
+    parts = address.split()
+    for part in parts:
+        if part.endswith('동') and len(part) >= 2 and not part.endswith('읍동'):
+            return part
+    for part in parts:
+        if part.endswith('읍') or part.endswith('면'):
+            return part
+    return ""
+
+
+def area_coords(parking_lots: Iterable[Dict]) -> Dict[str, Tuple[float, float]]:
+    """동/읍/면 -> 좌표 (DONG_COORDS 우선, 없으면 그 지역 주차장 좌표 평균)"""
+    sums: Dict[str, List[float]] = {}
+    for lot in parking_lots:
+        lat, lon = lot.get('latitude'), lot.get('longitude')
+        area = extract_dong_from_address(lot.get('address', ''))
+        if not area or not lat or not lon:
+            continue
+        acc = sums.setdefault(area, [0.0, 0.0, 0])
+        acc[0] += lat
+        acc[1] += lon
+        acc[2] += 1
+    coords = {area: (acc[0] / acc[2], acc[1] / acc[2]) for area, acc in sums.items()}
+    coords.update(DONG_COORDS)
+    return coords
+
+
+def _cell_centers() -> Tuple[np.ndarray, np.ndarray]:
+    n_rows = int(round((MAX_LAT - MIN_LAT) / CELL_LAT))
+    n_cols = int(round((MAX_LON - MIN_LON) / CELL_LON))
+    lats = MIN_LAT + (np.arange(n_rows) + 0.5) * CELL_LAT
+    lons = MIN_LON + (np.arange(n_cols) + 0.5) * CELL_LON
+    return lats, lons
+
+
+def build_density(points: Iterable[Tuple[float, float, float]], bandwidth_km: float = BANDWIDTH_KM) -> np.ndarray:
+    """(위도, 경도, 건수) 점들로 커널 밀도 격자 계산, 최댓값이 1이 되도록 정규화"""
+    lats, lons = _cell_centers()
+    km_per_lat = 111.32
+    km_per_lon = 111.32 * math.cos(math.radians((MIN_LAT + MAX_LAT) / 2))
+    density = np.zeros((len(lats), len(lons)), dtype=np.float64)
+    for lat, lon, weight in points:
+        dy = (lats - lat) * km_per_lat
+        dx = (lons - lon) * km_per_lon
+        # exp(-(dx^2 + dy^2) / 2s^2) = exp(-dy^2 / 2s^2) * exp(-dx^2 / 2s^2)
+        density += weight * np.outer(np.exp(-dy ** 2 / (2 * bandwidth_km ** 2)),
+                                     np.exp(-dx ** 2 / (2 * bandwidth_km ** 2)))
+    peak = density.max()
+    if peak > 0:
+        density /= peak
+    return density.astype(np.float32)
+
+
+def build_from_counts(counts: Dict[str, int], coords: Dict[str, Tuple[float, float]],
+                      bandwidth_km: float = BANDWIDTH_KM) -> Tuple[np.ndarray, Dict]:
+    """동별 단속 건수 -> (밀도 격자, 메타 정보)"""
+    points, used, skipped = [], {}, {}
+    for area, count in counts.items():
+        if area in coords:
+            points.append((coords[area][0], coords[area][1], count))
+            used[area] = count
+        else:
+            skipped[area] = count
+    density = build_density(points, bandwidth_km)
+    meta = {
+        'min_lat': MIN_LAT, 'max_lat': MAX_LAT, 'min_lon': MIN_LON, 'max_lon': MAX_LON,
+        'cell_lat': CELL_LAT, 'cell_lon': CELL_LON,
+        'bandwidth_km': bandwidth_km,
+        'shape': list(density.shape),
+        'total_count': sum(used.values()),
+        'areas': used,
+        'skipped_areas': skipped,
+    }
+    return density, meta
+
+
+def save(density: np.ndarray, meta: Dict, npy_path: Path = DENSITY_NPY, meta_path: Path = DENSITY_META_JSON):
+    # 실행 중인 백엔드가 기존 .npy를 mmap하고 있으므로 lot_columns와 같이 임시 파일에 쓴 뒤 교체하고,
+    # 메타 정보(shape)는 배열 교체 뒤에 써서 읽는 쪽이 두 파일이 맞는지 확인할 수 있게 한다
+    # (함수 배포본에는 lot_columns가 없어서 같은 방식을 여기에 둔다)
+    tmp_npy = npy_path.with_name(npy_path.stem + '.tmp.npy')
+    np.save(tmp_npy, density)
+    os.replace(tmp_npy, npy_path)
+    tmp_meta = meta_path.with_name(meta_path.name + '.tmp')
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_meta, meta_path)
+
+
+class HotspotDensity:
+    """밀도 격자 조회 (격자 밖 좌표는 0)"""
+
+    def __init__(self, density: np.ndarray, meta: Dict):
+        self.density = density
+        self.meta = meta
+        self.min_lat = meta['min_lat']
+        self.min_lon = meta['min_lon']
+        self.cell_lat = meta['cell_lat']
+        self.cell_lon = meta['cell_lon']
+        self.n_rows, self.n_cols = density.shape
+
+    @classmethod
+    def load(cls, npy_path: Path = DENSITY_NPY, meta_path: Path = DENSITY_META_JSON) -> Optional["HotspotDensity"]:
+        """저장된 격자를 메모리 매핑으로 열기 (파일이 없거나 깨져 있으면 None)"""
+        if not npy_path.exists() or not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            density = np.load(npy_path, mmap_mode='r')
+        except (ValueError, OSError) as e:
+            print(f"Hotspot density load failed: {e}")
+            return None
+        if list(density.shape) != meta.get('shape'):
+            print(f"Hotspot density shape mismatch: {density.shape} vs {meta.get('shape')}")
+            return None
+        return cls(density, meta)
+
+    def lookup(self, lat: float, lon: float) -> float:
+        """좌표가 속한 격자의 밀도 (0~1)"""
+        row = math.floor((lat - self.min_lat) / self.cell_lat)
+        col = math.floor((lon - self.min_lon) / self.cell_lon)
+        if 0 <= row < self.n_rows and 0 <= col < self.n_cols:
+            return float(self.density[row, col])
+        return 0.0
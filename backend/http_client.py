@@ -0,0 +1,147 @@
+"""
+외부 API(기상청, 특일정보) 공용 비동기 HTTP 클라이언트
+- 커넥션 풀 재사용 (httpx.AsyncClient)
+- 호스트별 동시 요청 수 제한, 타임아웃
+- 지수 백오프 + 지터 재시도
+- 호스트별 서킷 브레이커 (연속 실패 시 일정 시간 요청 차단)
+"""
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않음"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.open_count = 0
+        self.probe_started_at: Optional[float] = None   # half-open 시험 요청 시작 시각
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        # half-open 상태에서는 시험 요청 하나만 보내 보고 결과에 따라 닫거나 다시 연다
+        state = self.state
+        if state != "half-open":
+            return state == "closed"
+        now = time.monotonic()
+        # 결과를 기록하지 못하고 끝난 시험 요청은 reset_timeout 뒤에 다른 요청으로 교체
+        if self.probe_started_at is not None and now - self.probe_started_at < self.reset_timeout:
+            return False
+        self.probe_started_at = now
+        return True
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.probe_started_at = None
+        if self.state == "half-open" or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self.open_count += 1
+
+
+class UpstreamClient:
+    def __init__(
+        self,
+        max_connections: int = 20,
+        per_host_limit: int = 4,
+        timeout: float = 5.0,
+        retries: int = 2,
+        backoff_base: float = 0.3,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 60,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.request_count = 0
+        self.retry_count = 0
+        self.failure_count = 0
+        self.rejected_count = 0
+
+    def _host_state(self, url: str):
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+            self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+        return self._semaphores[host], self._breakers[host]
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        """GET 요청 (네트워크 오류/5xx/429는 재시도, 최종 실패 시 예외)"""
+        semaphore, breaker = self._host_state(url)
+        if not breaker.allow():
+            self.rejected_count += 1
+            raise CircuitOpenError(f"circuit open for {urlsplit(url).netloc}")
+
+        last_error: Optional[Exception] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.retry_count += 1
+                delay = self.backoff_base * (2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            try:
+                self.request_count += 1
+                async with semaphore:
+                    response = await self._client.get(url, params=params)
+                if response.status_code not in RETRY_STATUS:
+                    breaker.record_success()
+                    return response
+                last_error = httpx.HTTPStatusError(
+                    f"status {response.status_code}", request=response.request, response=response)
+            except httpx.TransportError as e:
+                last_error = e
+
+        self.failure_count += 1
+        breaker.record_failure()
+        raise last_error
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "failures": self.failure_count,
+            "rejected_by_breaker": self.rejected_count,
+            "hosts": {
+                host: {
+                    "breaker": breaker.state,
+                    "consecutive_failures": breaker.consecutive_failures,
+                    "opened": breaker.open_count,
+                }
+                for host, breaker in self._breakers.items()
+            },
+        }
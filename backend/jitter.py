@@ -0,0 +1,45 @@
+"""
+결정론적 예측 변동 (counter-based hash)
+전역 random 상태나 PYTHONHASHSEED에 의존하지 않으므로 워커/재시작과 무관하게 같은 값을 낸다.
+"""
+import hashlib
+
+import numpy as np
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_STREAM = np.uint64(0xD1B54A32D192ED03)
+
+# 변동 종류별 스트림 번호 (같은 주차장/시간이라도 서로 다른 값이 나오도록)
+STREAM_LIVE = 1   # 현재 시각(시) 기준 Live 변동
+STREAM_HOUR = 2   # 예측 대상 시간대별 변동
+
+
+def lot_seed(parking_id: str) -> int:
+    """주차장 ID -> 64비트 시드"""
+    return int.from_bytes(hashlib.blake2b(parking_id.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    with np.errstate(over='ignore'):
+        z = x + _GOLDEN
+        z = (z ^ (z >> np.uint64(30))) * _MIX1
+        z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def uniform(seeds, counters, stream: int, low: float, high: float) -> np.ndarray:
+    """(시드, 카운터, 스트림)마다 고정된 [low, high) 균등 분포 값 (브로드캐스팅 지원)"""
+    seeds = np.asarray(seeds, dtype=np.uint64)
+    counters = np.asarray(counters, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        x = seeds ^ _splitmix64(counters + np.uint64(stream) * _STREAM)
+    u = (_splitmix64(x) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    return low + (high - low) * u
+
+
+def lot_noise_table(parking_ids, stream: int, low: float, high: float, size: int = 24) -> np.ndarray:
+    """주차장 × 0..size-1 (보통 시간) 변동 테이블"""
+    seeds = np.array([lot_seed(pid) for pid in parking_ids], dtype=np.uint64)
+    return uniform(seeds[:, None], np.arange(size, dtype=np.uint64)[None, :], stream, low, high)
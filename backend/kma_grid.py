@@ -0,0 +1,110 @@
+"""
+기상청 격자 변환 (Lambert Conformal Conic, 5km 격자)
+- 투영 상수(sn, sf, ro)는 모듈 로드 시 한 번만 계산
+- 위경도 -> 격자 (스칼라 / NumPy 배열), 격자 -> 위경도 (격자점 중심)
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+NX = 149            # X축 격자점 수
+NY = 253            # Y축 격자점 수
+RE = 6371.00877     # 지도반경 (km)
+GRID = 5.0          # 격자간격 (km)
+SLAT1 = 30.0        # 표준위도 1
+SLAT2 = 60.0        # 표준위도 2
+OLON = 126.0        # 기준점 경도
+OLAT = 38.0         # 기준점 위도
+XO = 210 / GRID     # 기준점 X좌표
+YO = 675 / GRID     # 기준점 Y좌표
+
+DEGRAD = math.pi / 180.0
+RADDEG = 180.0 / math.pi
+
+
+def _projection_constants() -> Tuple[float, float, float, float]:
+    re = RE / GRID
+    slat1 = SLAT1 * DEGRAD
+    slat2 = SLAT2 * DEGRAD
+    olat = OLAT * DEGRAD
+
+    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sf = math.pow(sf, sn) * math.cos(slat1) / sn
+    ro = math.tan(math.pi * 0.25 + olat * 0.5)
+    ro = re * sf / math.pow(ro, sn)
+    return re, sn, sf, ro
+
+
+_RE, _SN, _SF, _RO = _projection_constants()
+_OLON = OLON * DEGRAD
+_RESF = _RE * _SF
+
+# 배열 계산 결과가 격자 경계에서 이 값보다 가까우면 스칼라 함수로 다시 계산 (부동소수 오차 대비)
+_EDGE_EPS = 1e-9
+
+
+def map_to_grid(lat: float, lon: float) -> Tuple[int, int]:
+    """위경도 -> 기상청 격자 (nx, ny)"""
+    ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
+    ra = _RESF / math.pow(ra, _SN)
+
+    theta = lon * DEGRAD - _OLON
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= _SN
+
+    x = (ra * math.sin(theta)) + XO
+    y = (_RO - ra * math.cos(theta)) + YO
+    return int(x + 1.5), int(y + 1.5)
+
+
+def map_to_grid_array(lats, lons) -> Tuple[np.ndarray, np.ndarray]:
+    """map_to_grid의 배열 버전 (결과는 스칼라 함수와 동일)"""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+
+    ra = np.tan(math.pi * 0.25 + lats * DEGRAD * 0.5)
+    ra = _RESF / np.power(ra, _SN)
+
+    theta = lons * DEGRAD - _OLON
+    theta = np.where(theta > math.pi, theta - 2.0 * math.pi, theta)
+    theta = np.where(theta < -math.pi, theta + 2.0 * math.pi, theta)
+    theta = theta * _SN
+
+    x = (ra * np.sin(theta)) + XO + 1.5
+    y = (_RO - ra * np.cos(theta)) + YO + 1.5
+    nx = np.trunc(x).astype(np.int64)
+    ny = np.trunc(y).astype(np.int64)
+
+    # NumPy와 math의 초월함수는 마지막 비트가 다를 수 있으므로 경계 근처 점만 스칼라로 확인
+    edge = (np.abs(x - np.round(x)) < _EDGE_EPS) | (np.abs(y - np.round(y)) < _EDGE_EPS)
+    for i in np.flatnonzero(edge):
+        nx.flat[i], ny.flat[i] = map_to_grid(float(lats.flat[i]), float(lons.flat[i]))
+    return nx, ny
+
+
+def grid_to_latlon(nx: int, ny: int) -> Tuple[float, float]:
+    """기상청 격자 (nx, ny) -> 격자점 위경도"""
+    xn = (nx - 1) - XO
+    yn = _RO - (ny - 1) + YO
+    ra = math.sqrt(xn * xn + yn * yn)
+    if _SN < 0.0:
+        ra = -ra
+    alat = math.pow(_RESF / ra, 1.0 / _SN)
+    alat = 2.0 * math.atan(alat) - math.pi * 0.5
+
+    if abs(xn) <= 0.0:
+        theta = 0.0
+    elif abs(yn) <= 0.0:
+        theta = math.pi * 0.5
+        if xn < 0.0:
+            theta = -theta
+    else:
+        theta = math.atan2(xn, yn)
+    alon = theta / _SN + _OLON
+    return alat * RADDEG, alon * RADDEG
@@ -0,0 +1,238 @@
+"""
+주차장 열(column) 저장소
+- 숫자 값(좌표, 주차면수, 요금)은 NumPy 구조체 배열 한 줄에 주차장 하나
+- 문자열은 UTF-8로 이어 붙인 문자열 테이블(중복 제거)에 두고, 구조체에는 (시작, 길이)만 저장
+- parking_ingest가 JSON과 함께 .npy로 저장하고, 백엔드는 mmap으로 열어 워커끼리 페이지를 공유
+  (공유되는 것은 배열 자체뿐: 예측 엔진용 dict 목록과 미리 직렬화한 응답 본문은 워커마다 따로 만든다)
+- 영역/반경 검색은 로드할 때 만드는 격자 정렬 인덱스로 주변 격자 행만 확인 (O(log n + k))
+- 파일은 임시 파일에 쓴 뒤 교체 (mmap으로 열려 있는 기존 파일을 덮어쓰지 않음)
+"""
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent
+LOTS_NPY = BACKEND_DIR / "parking_lots.npy"
+LOT_STRINGS_NPY = BACKEND_DIR / "parking_lots_strings.npy"
+LOTS_META_JSON = BACKEND_DIR / "parking_lots_meta.json"
+
+COLUMNS_VERSION = 1
+EARTH_RADIUS_KM = 6371
+KM_PER_DEG_LAT = 111.32
+GRID_CELL_DEG = 0.01    # 격자 인덱스 셀 크기 (약 1km)
+_COL_OFFSET = 1 << 31   # 음수 경도 셀도 정렬 순서가 유지되도록 더하는 값
+
+FACILITY_SEP = '|'
+NO_VALUE = -1   # availableSpaces 등 값이 없는 정수 칸
+
+STRING_FIELDS = (
+    'id', 'managementNo', 'name', 'type', 'parkingType', 'address', 'operatingHours',
+    'feeType', 'feeInfo', 'paymentMethods', 'facilities', 'managingOrg', 'phone', 'dataDate',
+)
+# 구조체 필드 -> fee 딕셔너리 키
+FEE_FIELDS = (
+    ('feeBasic', 'basic'),
+    ('feeBasicTime', 'basicTime'),
+    ('feeAdditional', 'additional'),
+    ('feeAdditionalTime', 'additionalTime'),
+    ('feeDaily', 'daily'),
+    ('feeMonthly', 'monthly'),
+    ('feeGracePeriod', 'gracePeriod'),
+)
+
+LOT_DTYPE = np.dtype(
+    [('latitude', '<f8'), ('longitude', '<f8'), ('totalSpaces', '<i4'), ('availableSpaces', '<i4')]
+    + [(field, '<i4') for field, _ in FEE_FIELDS]
+    + [('hasDisabledParking', '?')]
+    + [(field, '<u4', (2,)) for field in STRING_FIELDS]    # 문자열 테이블 (시작, 길이)
+)
+
+
+def _int_or(value: Any, default: int) -> int:
+    return default if value is None else int(value)
+
+
+def _replace_npy(path: Path, array: np.ndarray):
+    # np.save는 확장자를 붙이므로 임시 파일도 .npy로 만든 뒤 교체
+    tmp_path = path.with_name(path.stem + '.tmp.npy')
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+class LotColumns:
+    """주차장 목록의 열 형식 (records는 mmap일 수 있으므로 읽기 전용으로 다룬다)"""
+
+    def __init__(self, records: np.ndarray, strings: np.ndarray, meta: Optional[Dict] = None):
+        self.records = records
+        self.strings = strings      # uint8 문자열 테이블
+        self.meta = meta or {}
+        self.latitude = records['latitude']
+        self.longitude = records['longitude']
+        self.has_coords = (self.latitude != 0) & (self.longitude != 0)
+        self.ids = [self._string(span) for span in records['id']]
+        self.index = {pid: i for i, pid in enumerate(self.ids)}
+        self._build_grid()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # ===== 생성/저장 =====
+    @classmethod
+    def from_lots(cls, lots: List[Dict], meta: Optional[Dict] = None) -> "LotColumns":
+        """주차장 dict 목록 -> 열 형식 (메모리)"""
+        records = np.zeros(len(lots), dtype=LOT_DTYPE)
+        table = bytearray()
+        spans: Dict[str, Tuple[int, int]] = {}
+
+        def intern(text: str) -> Tuple[int, int]:
+            span = spans.get(text)
+            if span is None:
+                data = text.encode('utf-8')
+                span = spans[text] = (len(table), len(data))
+                table.extend(data)
+            return span
+
+        for i, lot in enumerate(lots):
+            fee = lot.get('fee') or {}
+            row = records[i]
+            row['latitude'] = lot.get('latitude') or 0.0
+            row['longitude'] = lot.get('longitude') or 0.0
+            row['totalSpaces'] = _int_or(lot.get('totalSpaces'), 0)
+            row['availableSpaces'] = _int_or(lot.get('availableSpaces'), NO_VALUE)
+            for field, key in FEE_FIELDS:
+                row[field] = _int_or(fee.get(key), 0)
+            row['hasDisabledParking'] = bool(lot.get('hasDisabledParking'))
+            texts = dict(lot, feeType=fee.get('type', ''), facilities=FACILITY_SEP.join(lot.get('facilities') or []))
+            for field in STRING_FIELDS:
+                row[field] = intern(texts.get(field) or '')
+
+        meta = dict(meta or {}, columnsVersion=COLUMNS_VERSION, count=len(lots), stringBytes=len(table))
+        return cls(records, np.frombuffer(bytes(table), dtype=np.uint8), meta)
+
+    def save(self, npy_path: Path = LOTS_NPY, strings_path: Path = LOT_STRINGS_NPY,
+             meta_path: Path = LOTS_META_JSON):
+        # 실행 중인 백엔드가 기존 파일을 mmap하고 있으므로 제자리에 덮어쓰지 않고 새 파일로 교체한다
+        # 메타 정보를 마지막에 써서, 읽는 쪽이 개수/크기로 배열 파일과 맞는지 확인할 수 있게 한다
+        _replace_npy(npy_path, self.records)
+        _replace_npy(strings_path, self.strings)
+        tmp_path = meta_path.with_name(meta_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, meta_path)
+
+    @classmethod
+    def load(cls, npy_path: Path = LOTS_NPY, strings_path: Path = LOT_STRINGS_NPY,
+             meta_path: Path = LOTS_META_JSON) -> Optional["LotColumns"]:
+        """저장된 열 파일을 메모리 매핑으로 열기 (없거나 깨져 있거나 형식이 다르면 None)"""
+        if not (npy_path.exists() and strings_path.exists() and meta_path.exists()):
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            records = np.load(npy_path, mmap_mode='r')
+            strings = np.load(strings_path, mmap_mode='r')
+        except (ValueError, OSError) as e:
+            print(f"Parking lot columns load failed: {e}")
+            return None
+        if meta.get('columnsVersion') != COLUMNS_VERSION or records.dtype != LOT_DTYPE:
+            print(f"Parking lot columns version mismatch: {meta.get('columnsVersion')}")
+            return None
+        if len(records) != meta.get('count') or len(strings) != meta.get('stringBytes'):
+            print(f"Parking lot columns size mismatch: {len(records)} lots, {len(strings)} bytes")
+            return None
+        return cls(records, strings, meta)
+
+    # ===== 조회 =====
+    def _string(self, span) -> str:
+        start, length = int(span[0]), int(span[1])
+        return self.strings[start:start + length].tobytes().decode('utf-8')
+
+    def to_dict(self, i: int) -> Dict[str, Any]:
+        """i번째 주차장 -> parkingLots.json과 같은 형식의 dict"""
+        row = self.records[i]
+        texts = {field: self._string(row[field]) for field in STRING_FIELDS}
+        fee = {'type': texts['feeType']}
+        fee.update((key, int(row[field])) for field, key in FEE_FIELDS)
+        available = int(row['availableSpaces'])
+        return {
+            'id': texts['id'],
+            'managementNo': texts['managementNo'],
+            'name': texts['name'],
+            'type': texts['type'],
+            'parkingType': texts['parkingType'],
+            'address': texts['address'],
+            'totalSpaces': int(row['totalSpaces']),
+            'availableSpaces': None if available == NO_VALUE else available,
+            'operatingHours': texts['operatingHours'],
+            'fee': fee,
+            'feeInfo': texts['feeInfo'],
+            'paymentMethods': texts['paymentMethods'],
+            'latitude': float(row['latitude']),
+            'longitude': float(row['longitude']),
+            'hasDisabledParking': bool(row['hasDisabledParking']),
+            'facilities': texts['facilities'].split(FACILITY_SEP) if texts['facilities'] else [],
+            'managingOrg': texts['managingOrg'],
+            'phone': texts['phone'],
+            'dataDate': texts['dataDate'],
+        }
+
+    def to_dicts(self, indices=None) -> List[Dict[str, Any]]:
+        rows = range(len(self)) if indices is None else indices
+        return [self.to_dict(int(i)) for i in rows]
+
+    # ===== 격자 인덱스 =====
+    def _cell_keys(self, lat, lon):
+        """(격자 행, 격자 열) -> 정렬 가능한 int64 키 (같은 격자 행은 키가 연속)"""
+        row = np.floor(np.asarray(lat) / GRID_CELL_DEG).astype(np.int64)
+        col = np.floor(np.asarray(lon) / GRID_CELL_DEG).astype(np.int64)
+        return (row << 32) + col + _COL_OFFSET
+
+    def _build_grid(self):
+        """좌표가 있는 주차장을 격자 키 순으로 정렬해 둔다 (mmap 배열은 그대로, 인덱스만 메모리)"""
+        rows = np.flatnonzero(self.has_coords)
+        keys = self._cell_keys(self.latitude[rows], self.longitude[rows])
+        order = np.argsort(keys, kind='stable')
+        self._grid_keys = keys[order]
+        self._grid_rows = rows[order]
+        self._grid_lat_rows = np.unique(self._grid_keys >> 32)    # 주차장이 있는 격자 행
+
+    def _candidates(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """영역과 겹치는 셀의 행 번호 (셀 경계 때문에 영역 밖 주차장이 섞일 수 있음)"""
+        lo_key, hi_key = self._cell_keys([min_lat, max_lat], [min_lon, max_lon])
+        r0, r1 = int(lo_key >> 32), int(hi_key >> 32)
+        c0, c1 = int(lo_key & 0xFFFFFFFF), int(hi_key & 0xFFFFFFFF)
+        # 주차장이 있는 격자 행만 돌고, 각 행에서 열 범위는 정렬된 키에서 한 구간
+        lat_rows = self._grid_lat_rows
+        lat_rows = lat_rows[np.searchsorted(lat_rows, r0):np.searchsorted(lat_rows, r1, side='right')]
+        if len(lat_rows) == 0:
+            return np.empty(0, dtype=np.int64)
+        starts = np.searchsorted(self._grid_keys, (lat_rows << 32) + c0)
+        ends = np.searchsorted(self._grid_keys, (lat_rows << 32) + c1, side='right')
+        return np.concatenate([self._grid_rows[a:b] for a, b in zip(starts, ends)])
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        """영역 안에 있는 주차장 행 번호 (파일 순서)"""
+        idx = self._candidates(min_lat, min_lon, max_lat, max_lon)
+        lat, lon = self.latitude[idx], self.longitude[idx]
+        keep = (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+        return np.sort(idx[keep])
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 안의 주차장을 가까운 순으로 (거리 km 배열, 행 번호 배열)"""
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        idx = self.within_bbox(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+        lat1, lon1 = math.radians(lat), math.radians(lon)
+        lat2, lon2 = np.radians(self.latitude[idx]), np.radians(self.longitude[idx])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        dist = EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+        keep = dist <= radius_km
+        dist, idx = dist[keep], idx[keep]
+        order = np.argsort(dist, kind='stable')[:limit]
+        return dist[order], idx[order]
@@ -4,24 +4,37 @@
 """
 import json
 import asyncio
+import hashlib
 import os
-import math
-import random
-import requests
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 
 import numpy as np
 import pandas as pd
 import jwt
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from passlib.context import CryptContext
-from pydantic import BaseModel, EmailStr
-from sqlalchemy import Column, Integer, String, DateTime, Float, create_engine, func
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import Column, Index, Integer, String, DateTime, Float, create_engine, func, select, tuple_
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 
+from holiday_calendar import HolidayCalendar
+from hotspot_density import DENSITY_META_JSON, DENSITY_NPY
+from kma_grid import grid_to_latlon, map_to_grid
+from lot_columns import LOT_STRINGS_NPY, LOTS_META_JSON, LOTS_NPY, LotColumns
+from parking_ingest import load_lots
+from password_hasher import HasherBusyError, PasswordHasher
+from prediction_engine import CITY_CENTER, FORECAST_HORIZON_HOURS, PredictionEngine, get_kst_now
+from upstream_api import (KMA_API_BASE_URL, fetch_cells_weather, fetch_holidays_for_year,
+                          get_vilage_fcst_base_time, make_upstream_client)
+from violation_counts import DONG_TENSOR_NPZ
+from weather_provider import WeatherProvider
+
 app = FastAPI(title="Cheonan AI Parking Pass API")
 
 # CORS 설정
@@ -38,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.get("/health")
@@ -81,7 +95,7 @@ async def weather_debug():
     kst_now = get_kst_now()
     base_date, base_time = get_vilage_fcst_base_time(kst_now)
     
-    url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
+    url = f"{KMA_API_BASE_URL}/getVilageFcst"
     params = {
         "serviceKey": api_key,
         "pageNo": "1",
@@ -94,7 +108,7 @@ async def weather_debug():
     }
     
     try:
-        response = requests.get(url, params=params, timeout=5)
+        response = await upstream_client.get(url, params=params)
         return {
             "url": url.replace(api_key, "HIDDEN") if api_key else url,
             "status_code": response.status_code,
@@ -113,6 +127,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # ===== 경로 설정 =====
@@ -175,17 +190,16 @@ def get_db():
         db.close()
 
 # ===== 비밀번호/JWT 설정 =====
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# 해시/검증은 전용 스레드 풀에서 실행 (동시 실행 수, 대기열 길이, pbkdf2 rounds는 환경 변수로 조정)
+password_hasher = PasswordHasher(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+    max_queue=int(os.getenv("PASSWORD_HASH_QUEUE", "32")),
+    rounds=int(os.getenv("PASSWORD_HASH_ROUNDS", "0")) or None,   # 0이면 passlib 기본값
+)
 SECRET_KEY = os.getenv("JWT_SECRET", "dev-secret")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
-
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -212,6 +226,12 @@ class PaymentHistory(Base):
     fee = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # /history 정렬 순서 (created_at desc, id desc) 그대로 인덱스를 타도록 id까지 포함
+    __table_args__ = (
+        Index("ix_payment_history_user_created", "user_id", "created_at", "id"),
+        Index("ix_payment_history_created", "created_at", "id"),
+    )
+
 class Vehicle(Base):
     __tablename__ = "vehicles"
     id = Column(Integer, primary_key=True, index=True)
@@ -241,9 +261,15 @@ class ParkingLotOut(BaseModel):
     managingOrg: Optional[str] = None
     phone: Optional[str] = None
 
+class NearbyParkingLotOut(ParkingLotOut):
+    distanceKm: float
+
+# 요청 하나가 계산하는 (주차장 × 시간) 행렬 크기 상한
+MAX_BULK_PARKING_IDS = 500
+
 class PredictionRequest(BaseModel):
     parking_id: str
-    hours_ahead: int = 24
+    hours_ahead: int = Field(24, ge=1, le=FORECAST_HORIZON_HOURS)
 
 class PredictionData(BaseModel):
     time: str
@@ -251,6 +277,17 @@ class PredictionData(BaseModel):
     confidence: float
     factors: Optional[Dict[str, float]] = None
 
+class BoundingBox(BaseModel):
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+class BulkPredictionRequest(BaseModel):
+    parking_ids: Optional[List[str]] = Field(None, max_length=MAX_BULK_PARKING_IDS)
+    bbox: Optional[BoundingBox] = None
+    hours_ahead: int = Field(24, ge=1, le=FORECAST_HORIZON_HOURS)
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -305,503 +342,203 @@ class VehicleOut(BaseModel):
         orm_mode = True
 
 # ===== 데이터 로드 =====
-_parking_lots_cache: List[Dict] = []
-_violation_patterns_cache: Dict = {}
-
-def load_parking_lots() -> List[Dict]:
-    global _parking_lots_cache
-    if _parking_lots_cache:
-        return _parking_lots_cache
-    
-    if PARKING_JSON.exists():
-        with open(PARKING_JSON, 'r', encoding='utf-8') as f:
-            _parking_lots_cache = json.load(f)
-    return _parking_lots_cache
+def read_json_file(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 def load_violation_patterns() -> Dict:
-    global _violation_patterns_cache
-    if _violation_patterns_cache:
-        return _violation_patterns_cache
-    
-    if VIOLATION_PATTERNS_JSON.exists():
-        with open(VIOLATION_PATTERNS_JSON, 'r', encoding='utf-8') as f:
-            _violation_patterns_cache = json.load(f)
-    return _violation_patterns_cache
-
-def extract_dong_from_address(address: str) -> str:
-    if not address:
-        return ""
-    parts = address.split()
-    for part in parts:
-        if part.endswith('동') and len(part) >= 2 and not part.endswith('읍동'):
-            return part
-    for part in parts:
-        if part.endswith('읍') or part.endswith('면'):
-            return part
-    return ""
-
-# ===== 날씨 및 휴일 API 유틸리티 =====
-
-# 기상청 격자 변환 (위경도 -> X,Y)
-def get_kst_now():
-    """서버 시간(UTC)을 한국 시간(KST)으로 변환"""
-    return datetime.utcnow() + timedelta(hours=9)
-
-def map_to_grid(lat, lon, code=0):
-    NX = 149            # X축 격자점 수
-    NY = 253            # Y축 격자점 수
-    items = dict()
-    items['re'] = 6371.00877    # 지도반경
-    items['grid'] = 5.0         # 격자간격 (km)
-    items['slat1'] = 30.0       # 표준위도 1
-    items['slat2'] = 60.0       # 표준위도 2
-    items['olon'] = 126.0       # 기준점 경도
-    items['olat'] = 38.0        # 기준점 위도
-    items['xo'] = 210 / items['grid']   # 기준점 X좌표
-    items['yo'] = 675 / items['grid']   # 기준점 Y좌표
-    
-    DEGRAD = math.pi / 180.0
-    RADDEG = 180.0 / math.pi
-    
-    re = items['re'] / items['grid']
-    slat1 = items['slat1'] * DEGRAD
-    slat2 = items['slat2'] * DEGRAD
-    olon = items['olon'] * DEGRAD
-    olat = items['olat'] * DEGRAD
-    
-    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
-    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
-    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
-    sf = math.pow(sf, sn) * math.cos(slat1) / sn
-    ro = math.tan(math.pi * 0.25 + olat * 0.5)
-    ro = re * sf / math.pow(ro, sn)
-    
-    ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
-    ra = re * sf / math.pow(ra, sn)
-    
-    theta = lon * DEGRAD - olon
-    if theta > math.pi:
-        theta -= 2.0 * math.pi
-    if theta < -math.pi:
-        theta += 2.0 * math.pi
-    theta *= sn
-    
-    x = (ra * math.sin(theta)) + items['xo']
-    y = (ro - ra * math.cos(theta)) + items['yo']
-    
-    return int(x + 1.5), int(y + 1.5)
+    return get_data_snapshot().patterns
 
-def get_vilage_fcst_base_time(now: datetime) -> Tuple[str, str]:
-    """단기예보 Base Time 계산 (02, 05, 08, 11, 14, 17, 20, 23시 + 10분)"""
-    # API 제공 시각을 고려해 15분 전 시간을 기준으로 계산
-    target = now - timedelta(minutes=15)
-    
-    hour = target.hour
-    if hour < 2:
-        base_hour = 23
-        base_date = (target - timedelta(days=1)).strftime("%Y%m%d")
-    else:
-        base_hour = ((hour - 2) // 3) * 3 + 2
-        base_date = target.strftime("%Y%m%d")
-        
-    return base_date, f"{base_hour:02d}00"
+def _encode_json(data: Any) -> bytes:
+    # FastAPI JSONResponse와 같은 형식으로 직렬화
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
 
-async def fetch_real_weather(lat: float, lon: float):
-    """기상청 단기예보 조회 (강수확률 포함)"""
-    api_key = os.getenv("VITE_KMA_API_KEY") or os.getenv("KMA_API_KEY")
-    if not api_key or api_key == "your_kma_key":
-        return None
-    
-    nx, ny = map_to_grid(lat, lon)
-    # 한국 시간 기준 처리 필수
-    kst_now = get_kst_now()
-    base_date, base_time = get_vilage_fcst_base_time(kst_now)
-    
-    # 공공데이터포털 특유의 인증키 문제를 방지하기 위해 URL에 직접 포함하는 방식 권장
-    # 단, requests lib의 자동 인코딩을 고려해 Decoding 키를 사용하는 것이 일반적
-    url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getVilageFcst"
-    params = {
-        "serviceKey": api_key,
-        "pageNo": "1",
-        "numOfRows": "1000",
-        "dataType": "JSON",
-        "base_date": base_date,
-        "base_time": base_time,
-        "nx": nx,
-        "ny": ny
-    }
-    
-    try:
-        # 비동기적으로 동기 요청 실행 (이벤트 루프 차단 방지)
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, lambda: requests.get(url, params=params, timeout=5))
-        if response.status_code == 200:
-            data = response.json()
-            items = data['response']['body']['items']['item']
-            
-            # 가장 빠른 예측 시간의 데이터 수집
-            weather = {}
-            target_fcst_time = None
-            
-            for item in items:
-                # 첫 번째 나오는 fcstTime을 타겟으로 잡음 (가장 가까운 미래)
-                if target_fcst_time is None:
-                    target_fcst_time = item['fcstTime']
-                
-                if item['fcstTime'] == target_fcst_time:
-                    cat = item['category']
-                    val = item['fcstValue']
-                    
-                    if cat == 'TMP': # 1시간 기온
-                        weather['temperature'] = float(val)
-                    elif cat == 'POP': # 강수확률
-                        weather['pop'] = int(val)
-                    elif cat == 'PTY': # 강수형태
-                        weather['pty'] = int(val)
-                    elif cat == 'SKY': # 하늘상태 (1:맑음, 3:구름많음, 4:흐림)
-                        weather['sky'] = int(val)
-
-            # 상태 매핑
-            condition = "sunny"
-            if weather.get('pty', 0) > 0:
-                pty = weather.get('pty')
-                if pty in [1, 5, 4]: condition = "rainy" # 비, 빗방울, 소나기
-                elif pty in [2, 3]: condition = "snowy"  # 비/눈, 눈
-            elif weather.get('sky', 1) > 2:
-                condition = "cloudy"
-            
-            return {
-                "temperature": weather.get('temperature', 0),
-                "condition": condition,
-                "precipitationProbability": weather.get('pop', 0),
-                "rain_mm": 0,
-                "air_quality": "좋음",
-                "pm10": 15,
-                "pm25": 8
-            }
-    except Exception as e:
-        print(f"Weather API Error: {e}")
-        return None
-    return None
-
-async def check_is_holiday(date_str: str =  None):
-    """특일(공휴일) 정보 조회"""
-    kst_now = get_kst_now()
-    if not date_str:
-        date_str = kst_now.strftime("%Y%m%d")
-    
-    api_key = os.getenv("VITE_HOLIDAY_API_KEY") or os.getenv("HOLIDAY_API_KEY")
-    if not api_key or api_key == "your_holiday_key":
-        # 주말 체크만
-        dt = datetime.strptime(date_str, "%Y%m%d")
-        return dt.weekday() >= 5
-        
-    year = date_str[:4]
-    month = date_str[4:6]
-    
-    url = "http://apis.data.go.kr/B090041/openapi/service/SpcdeInfoService/getRestDeInfo"
-    params = {
-        "serviceKey": api_key,
-        "solYear": year,
-        "solMonth": month,
-        "_type": "json"
-    }
-    
-    try:
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, lambda: requests.get(url, params=params, timeout=5))
-        if response.status_code == 200:
-            data = response.json()
-            # items가 없거나 비어있는 경우 체크
-            if "items" in data["response"]["body"] and data["response"]["body"]["items"]:
-                items = data["response"]["body"]["items"]["item"]
-                if isinstance(items, dict):
-                    items = [items]
-                for item in items:
-                    if str(item["locdate"]) == date_str and item["isHoliday"] == "Y":
-                        return True
-    except Exception as e:
-        print(f"Holiday API Error: {e}")
-        pass
-    
-    # 주말 체크
-    dt = datetime.strptime(date_str, "%Y%m%d")
-    return dt.weekday() >= 5
+def _make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
 
-# ===== 가중치 기반 예측 엔진 =====
-class PredictionEngine:
-    
-    WEIGHTS = {
-        'hourly': 0.25,
-        'daily': 0.10,
-        'location': 0.15,
-        'proximity': 0.15,  # 신규: 인근 불법주정차 핫스팟 밀도
-        'fee': 0.10,
-        'capacity': 0.10,
-        'weather': 0.10,
-        'holiday': 0.05
-    }
-    
-    # 천안시 주요 동별 대표 좌표 (불법주정차 단속 데이터 기반)
-    HOTSPOT_COORDS = {
-        '성정동': (36.820, 127.139),
-        '불당동': (36.811, 127.109),
-        '두정동': (36.832, 127.139),
-        '백석동': (36.835, 127.155),
-        '성성동': (36.839, 127.117),
-        '신부동': (36.818, 127.158),
-        '쌍용동': (36.800, 127.123),
-        '차암동': (36.810, 127.145),
-        '신방동': (36.786, 127.122),
-        '직산읍': (36.879, 127.150),
-    }
-    
-    def __init__(self):
-        self.patterns = load_violation_patterns()
-        self.parking_lots = {lot['id']: lot for lot in load_parking_lots()}
-        
-        # 캐싱된 날씨/휴일 (메모리)
-        self.cached_weather = None
-        self.weather_updated = None
-        self.is_holiday_today = False
-        self.initialized_extras = False
-
-    async def update_extras(self):
-        """날씨 및 휴일 정보 업데이트"""
-        now = get_kst_now()
-        # 30분에 한번 날씨 업데이트 (API 호출 횟수 절약 및 캐시 활용)
-        if not self.cached_weather or not self.weather_updated or (now - self.weather_updated).total_seconds() > 1800:
-            lat, lon = 36.815, 127.113
-            w_data = await fetch_real_weather(lat, lon)
-            if w_data:
-                # weather_score 계산 (예측 모델용)
-                temp = w_data.get('temperature', 18)
-                cond = w_data.get('condition', 'sunny')
-                
-                # 비/눈 올 때 주차 수요 변화 가중치
-                w_score = 0
-                if cond == 'rainy': w_score = 0.2
-                elif cond == 'snowy': w_score = 0.3
-                
-                w_data['weather_score'] = w_score
-                self.cached_weather = w_data
-                self.weather_updated = now
-            else: 
-                # 실패 시 마지막 데이터 유지 시도, 아예 없으면 기본값(단, 영하임을 표시하기 위해 -10도 등으로 변경)
-                if not self.cached_weather:
-                    self.cached_weather = {
-                        "temperature": -10, 
-                        "condition": "cloudy", 
-                        "weather_score": 0,
-                        "air_quality": "보통",
-                        "pm10": 35,
-                        "pm25": 18
-                    }
-        
-        # 휴일 여부 (하루 한번만 체크해도 됨)
-        if not self.initialized_extras:
-            self.is_holiday_today = await check_is_holiday()
-            self.initialized_extras = True
-
-    def get_hourly_weight(self, hour: int) -> float:
-        if not self.patterns or 'hourly' not in self.patterns:
-            return 0.5
-        return self.patterns['hourly'].get(str(hour), {}).get('weight', 0.5)
-    
-    def get_daily_weight(self, weekday: int) -> float:
-        if not self.patterns or 'daily' not in self.patterns:
-            return 0.85
-        return self.patterns['daily'].get(str(weekday), {}).get('weight', 0.85)
-    
-    def get_location_weight(self, dong: str) -> float:
-        if not self.patterns or 'by_dong' not in self.patterns:
-            return 0.5
-        return self.patterns['by_dong'].get(dong, {}).get('weight', 0.3)
-    
-    def get_fee_weight(self, fee_type: str) -> float:
-        return 1.2 if fee_type == '무료' else 0.8
-    
-    def get_capacity_weight(self, total_spaces: int) -> float:
-        return 0.8 if total_spaces >= 100 else 1.1
+class ParkingLotStore:
+    """주차장 조회용 저장소: 열 형식 주차장 데이터, 검증/직렬화가 끝난 응답 본문과 ETag"""
 
-    def get_weather_weight(self, parking_type: str) -> float:
-        """날씨에 따른 주차장 선호도 (실내/실외)"""
-        if not self.cached_weather:
-            return 1.0
-        
-        cond = self.cached_weather.get('condition', 'sunny')
-        # 비/눈 올 때: 실내(indoor/building) 선호, 노외/노상(outdoor) 비선호
-        if cond in ['rainy', 'snowy']:
-            # parkingType: '노외', '노상', '부설' 등
-            if parking_type and '부설' in parking_type: # 보통 건물 내
-                return 1.2
-            else:
-                return 0.8
-        return 1.0 # 맑음
-
-    def get_holiday_weight(self, is_holiday: bool) -> float:
-        """휴일 여부"""
-        return 1.2 if is_holiday else 0.9
-
-    def get_proximity_weight(self, lat: float, lon: float) -> float:
-        """인근 불법주정차 핫스팟과의 거리에 따른 가중치"""
-        if not lat or not lon:
-            return 1.0
-            
-        min_dist = 999
-        max_violation_count = 0
-        
-        for dong, coords in self.HOTSPOT_COORDS.items():
-            dist = self._haversine(lat, lon, coords[0], coords[1])
-            if dist < min_dist:
-                min_dist = dist
-                # 해당 동의 단속 건수 가중치 반영
-                dong_data = self.patterns.get('by_dong', {}).get(dong, {})
-                max_violation_count = dong_data.get('count', 0)
-        
-        # 500m 이내면 강력 반영, 2km 넘어가면 미반영
-        if min_dist < 0.5:
-            proximity_score = 1.3
-        elif min_dist < 2.0:
-            proximity_score = 1.0 + (1.3 - 1.0) * (1 - (min_dist - 0.5) / 1.5)
-        else:
-            proximity_score = 1.0
-            
-        return proximity_score
-
-    def _haversine(self, lat1, lon1, lat2, lon2):
-        R = 6371  # 지구 반지름 (km)
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat / 2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
-
-    async def calculate_occupancy(
-        self,
-        parking_id: str,
-        target_time: datetime
-    ) -> tuple:
-        await self.update_extras()
-        
-        parking_lot = self.parking_lots.get(parking_id)
-        if not parking_lot:
-            return 50.0, 60.0, {}
-        
-        hour = target_time.hour
-        weekday = target_time.weekday()
-        dong = extract_dong_from_address(parking_lot.get('address', ''))
-        fee_type = parking_lot.get('fee', {}).get('type', '무료')
-        total_spaces = parking_lot.get('totalSpaces', 50)
-        p_type = parking_lot.get('parkingType', '') # 노외/노상/부설
-        
-        # 가중치 계산
-        hourly_w = self.get_hourly_weight(hour)
-        daily_w = self.get_daily_weight(weekday)
-        location_w = self.get_location_weight(dong)
-        fee_w = self.get_fee_weight(fee_type)
-        capacity_w = self.get_capacity_weight(total_spaces)
-        weather_w = self.get_weather_weight(p_type)
-        holiday_w = self.get_holiday_weight(self.is_holiday_today)
-        
-        # 종합 점수 (0-1)
-        weighted_score = (
-            hourly_w * self.WEIGHTS['hourly'] +
-            daily_w * self.WEIGHTS['daily'] +
-            location_w * self.WEIGHTS['location'] +
-            self.get_proximity_weight(parking_lot.get('latitude'), parking_lot.get('longitude')) * self.WEIGHTS['proximity'] +
-            fee_w * self.WEIGHTS['fee'] +
-            capacity_w * self.WEIGHTS['capacity'] +
-            weather_w * self.WEIGHTS['weather'] +
-            holiday_w * self.WEIGHTS['holiday']
-        )
-        
-        # 현실적인 점유율 분포를 위한 보정 (기본 15% ~ 최대 95%)
-        base_occupancy = 15.0
-        occupancy = base_occupancy + (weighted_score * 80)
+    def __init__(self, columns: LotColumns):
+        self.columns = columns
         
-        # 요일/시간대에 따른 추가 무작위성 및 Live 변동 (Random Walk 시뮬레이션)
-        # 시간(분/초)에 따라 결정론적으로 변하게 하여 모든 사용자에게 동일하게 "움직이는" 데이터 제공
-        now = get_kst_now()
-        seed_val = hash(f"{parking_id}-{now.hour}") % 10000
-        random.seed(seed_val)
-        
-        # 기본 랜덤 변동 (-3 ~ 3)
-        base_rand = random.uniform(-3, 3)
-        
-        # 실시간 "Live" 변동 (분 단위로 -1.5 ~ 1.5% 사이에서 출렁임)
-        # sin 함수를 이용해 부드러운 출렁임 구현
-        time_offset = math.sin(now.minute / 10 + now.second / 600) * 1.5
-        
-        occupancy += (base_rand + time_offset)
-        
-        # 요일/시간대에 따른 추가 무작위성 (신뢰도에 영향 없는 미세 변동)
-        random.seed(f"{parking_id}{hour}") # 재현 가능한 변동
-        occupancy += random.uniform(-5, 5)
-        
-        occupancy = max(5, min(95, occupancy))
-        
-        confidence = self._calculate_confidence(dong, hour)
-        
-        factors = {
-            'hourly': round(hourly_w, 3),
-            'location': round(location_w, 3),
-            'weather': round(weather_w, 3),
-            'holiday': round(holiday_w, 3)
-        }
-        
-        return round(occupancy, 1), round(confidence, 1), factors
-    
-    def _calculate_confidence(self, dong: str, hour: int) -> float:
-        base = 75.0
-        if not self.patterns: return 60.0
-        cnt = self.patterns.get('total_count', 0)
-        if cnt >= 50000: base += 10
-        if dong and dong in self.patterns.get('by_dong', {}):
-            d_cnt = self.patterns['by_dong'][dong].get('count', 0)
-            if d_cnt >= 1000: base += 8
-        return min(95.0, base)
-    
-    async def generate_predictions(
-        self,
-        parking_id: str,
-        hours_ahead: int = 24
-    ) -> List[Dict]:
-        predictions = []
-        now = datetime.now()
-        for i in range(hours_ahead):
-            target_time = now + timedelta(hours=i+1)
-            occupancy, confidence, factors = await self.calculate_occupancy(parking_id, target_time)
-            
-            predictions.append({
-                "time": target_time.strftime('%H:00'),
-                "occupancy_rate": occupancy,
-                "confidence": confidence,
-                "factors": factors
-            })
-        return predictions
-
-_prediction_engine: Optional[PredictionEngine] = None
+        self.lot_bodies: Dict[str, Tuple[bytes, str]] = {}
+        listed = []
+        for i, parking_id in enumerate(columns.ids):
+            lot_out = ParkingLotOut(**columns.to_dict(i))
+            body = _encode_json(lot_out)
+            self.lot_bodies[parking_id] = (body, _make_etag(body))
+            if columns.has_coords[i]:
+                listed.append(lot_out)
+        body = _encode_json(listed)
+        self.list_body = (body, _make_etag(body))
+
+    def get(self, parking_id: str) -> Optional[Dict]:
+        i = self.columns.index.get(parking_id)
+        return self.columns.to_dict(i) if i is not None else None
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[Dict]:
+        return self.columns.to_dicts(self.columns.within_bbox(min_lat, min_lon, max_lat, max_lon))
+
+    def ids_within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[str]:
+        return [self.columns.ids[i] for i in self.columns.within_bbox(min_lat, min_lon, max_lat, max_lon)]
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: int = 20) -> List[Tuple[float, Dict]]:
+        dists, idx = self.columns.nearby(lat, lon, radius_km, limit)
+        return list(zip(dists.tolist(), self.columns.to_dicts(idx)))
+
+def get_parking_lot_store() -> ParkingLotStore:
+    return get_data_snapshot().lot_store
+
+def cached_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """미리 직렬화된 JSON 응답 (If-None-Match가 일치하면 304)"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+# ===== 날씨 및 휴일 API =====
+upstream_client = make_upstream_client()
+
+# 상대 경로는 실행 위치(보통 backend/)가 아니라 .env가 있는 프로젝트 루트 기준
+HOLIDAY_CACHE_FILE = PROJECT_ROOT / os.getenv("HOLIDAY_CACHE_FILE", str(BACKEND_DIR / "holiday_cache.json"))
+
+# 공휴일 달력 (올해/내년을 미리 받아 파일로 보관, 하루 한 번 백그라운드 갱신)
+holiday_calendar = HolidayCalendar(partial(fetch_holidays_for_year, upstream_client), HOLIDAY_CACHE_FILE)
+
+WEATHER_REFRESH_INTERVAL = int(os.getenv("WEATHER_REFRESH_INTERVAL", "1800"))  # 초
+
+def weather_grid_cells() -> List[Tuple[int, int]]:
+    """날씨를 받아야 할 기상청 격자 (대표 좌표 + 주차장들이 속한 격자, 중복 제거)"""
+    cells = {map_to_grid(*CITY_CENTER)}
+    cells.update(get_data_snapshot().engine.grid_cells)
+    return sorted(cells)
+
+async def fetch_all_grid_weather() -> Optional[Dict]:
+    return await fetch_cells_weather(upstream_client, weather_grid_cells(), map_to_grid(*CITY_CENTER),
+                                     weather_provider.data)
+
+# 날씨는 데이터 스냅샷과 무관하게 프로세스당 하나의 provider가 백그라운드에서 갱신
+weather_provider = WeatherProvider(fetch_all_grid_weather, refresh_interval=WEATHER_REFRESH_INTERVAL)
+
+# ===== 데이터 스냅샷 (무중단 재로드) =====
+# 주차장/패턴 데이터와 그로부터 만든 인덱스/엔진을 한 묶음으로 만들고,
+# 파일이 바뀌면 요청 경로 밖에서 새 묶음을 만든 뒤 참조 하나만 교체한다.
+DATA_RELOAD_INTERVAL = int(os.getenv("DATA_RELOAD_INTERVAL", "60"))  # 초, 0이면 감시 안 함
+
+class DataSnapshot:
+    def __init__(self, version: int, signature: Tuple, columns: LotColumns, patterns: Dict,
+                 previous: Optional["DataSnapshot"] = None):
+        self.version = version
+        self.signature = signature
+        self.loaded_at = get_kst_now()
+        self.columns = columns
+        self.patterns = patterns
+        self.lot_store = ParkingLotStore(columns)
+        self.engine = PredictionEngine(columns.to_dicts(), patterns, weather=weather_provider, holidays=holiday_calendar)
+        if previous is not None:
+            self.engine.inherit_extras(previous.engine)
+
+def _data_file_signature() -> Tuple:
+    """데이터 파일 변경 감지용 (mtime, 크기)"""
+    signature = []
+    for path in (PARKING_JSON, LOTS_NPY, LOT_STRINGS_NPY, LOTS_META_JSON,
+                 VIOLATION_PATTERNS_JSON, DENSITY_NPY, DENSITY_META_JSON, DONG_TENSOR_NPZ):
+        try:
+            stat = path.stat()
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+def load_lot_columns() -> LotColumns:
+    """parking_ingest가 만든 열 형식 파일을 mmap으로 열고, 없거나 JSON보다 오래됐으면 JSON에서 만든다"""
+    columns = LotColumns.load()
+    if columns is not None and PARKING_JSON.exists():
+        if PARKING_JSON.stat().st_mtime_ns > LOTS_META_JSON.stat().st_mtime_ns:
+            print("Parking lot columns are older than parkingLots.json, using JSON")
+            columns = None
+    if columns is None:
+        columns = LotColumns.from_lots(load_lots(PARKING_JSON))
+    return columns
+
+def build_data_snapshot(previous: Optional[DataSnapshot] = None) -> DataSnapshot:
+    signature = _data_file_signature()
+    columns = load_lot_columns()
+    patterns = read_json_file(VIOLATION_PATTERNS_JSON, {})
+    version = previous.version + 1 if previous else 1
+    return DataSnapshot(version, signature, columns, patterns, previous)
+
+_data_snapshot: Optional[DataSnapshot] = None
+_data_reload_lock = asyncio.Lock()
+
+def get_data_snapshot() -> DataSnapshot:
+    global _data_snapshot
+    if _data_snapshot is None:
+        _data_snapshot = build_data_snapshot()
+    return _data_snapshot
+
+async def reload_data(force: bool = False) -> bool:
+    """파일이 바뀌었으면(또는 force) 새 스냅샷을 스레드에서 만든 뒤 교체"""
+    global _data_snapshot
+    async with _data_reload_lock:
+        current = get_data_snapshot()
+        if not force and _data_file_signature() == current.signature:
+            return False
+        loop = asyncio.get_running_loop()
+        try:
+            snapshot = await loop.run_in_executor(None, build_data_snapshot, current)
+        except Exception as e:
+            print(f"Data reload failed, keeping version {current.version}: {e}")
+            return False
+        _data_snapshot = snapshot
+        # 새 데이터에 날씨를 아직 받지 않은 격자가 있으면 바로 갱신
+        known_cells = (weather_provider.data or {}).get('cells', {})
+        if any(cell not in known_cells for cell in snapshot.engine.grid_cells):
+            weather_provider.trigger_refresh()
+        print(f"Data reloaded: version {snapshot.version} ({len(snapshot.columns)} parking lots)")
+        return True
+
+async def watch_data_files():
+    while True:
+        await asyncio.sleep(DATA_RELOAD_INTERVAL)
+        await reload_data()
 
 def get_prediction_engine() -> PredictionEngine:
-    global _prediction_engine
-    if _prediction_engine is None:
-        _prediction_engine = PredictionEngine()
-    return _prediction_engine
+    return get_data_snapshot().engine
 
 # ===== API 엔드포인트 =====
 @app.get("/parking-lots", response_model=List[ParkingLotOut])
-async def get_parking_lots():
-    lots = load_parking_lots()
-    return [ParkingLotOut(**lot) for lot in lots if lot.get('latitude') and lot.get('longitude')]
+async def get_parking_lots(request: Request):
+    body, etag = get_parking_lot_store().list_body
+    return cached_json_response(request, body, etag)
+
+@app.get("/parking-lots/nearby", response_model=List[NearbyParkingLotOut])
+async def get_nearby_parking_lots(lat: float, lon: float, radius: float = 1.0, limit: int = 20):
+    """반경(km) 안의 주차장을 가까운 순으로 반환"""
+    if radius <= 0 or limit <= 0:
+        raise HTTPException(status_code=400, detail="radius와 limit은 0보다 커야 합니다.")
+    found = get_parking_lot_store().nearby(lat, lon, radius, min(limit, 100))
+    return [NearbyParkingLotOut(**lot, distanceKm=round(dist, 3)) for dist, lot in found]
+
+@app.get("/parking-lots/bbox", response_model=List[ParkingLotOut])
+async def get_parking_lots_in_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+    """지도 화면 영역 안의 주차장만 반환"""
+    bbox = BoundingBox(min_lat=min_lat, min_lon=min_lon, max_lat=max_lat, max_lon=max_lon)
+    return [ParkingLotOut(**lot) for lot in find_lots_in_bbox(bbox)]
 
 @app.get("/parking-lots/{parking_id}", response_model=ParkingLotOut)
-async def get_parking_lot(parking_id: str):
-    lots = load_parking_lots()
-    lot = next((l for l in lots if l["id"] == parking_id), None)
-    if not lot:
+async def get_parking_lot(parking_id: str, request: Request):
+    cached = get_parking_lot_store().lot_bodies.get(parking_id)
+    if not cached:
         raise HTTPException(status_code=404, detail="Parking lot not found")
-    return ParkingLotOut(**lot)
+    body, etag = cached
+    return cached_json_response(request, body, etag)
 
 @app.post("/predictions", response_model=List[PredictionData])
 async def get_predictions(request: PredictionRequest):
@@ -810,6 +547,56 @@ async def get_predictions(request: PredictionRequest):
     predictions = await engine.generate_predictions(request.parking_id, request.hours_ahead)
     return [PredictionData(**pred) for pred in predictions]
 
+# 벌크 예측 시 한 번에 계산해서 내려보낼 주차장 수
+BULK_PREDICTION_CHUNK = 32
+
+def find_lots_in_bbox(bbox: BoundingBox) -> List[Dict]:
+    return get_parking_lot_store().within_bbox(bbox.min_lat, bbox.min_lon, bbox.max_lat, bbox.max_lon)
+
+@app.post("/predictions/bulk")
+async def get_bulk_predictions(request: BulkPredictionRequest):
+    """여러 주차장 예측을 NDJSON(한 줄에 주차장 하나)으로 스트리밍"""
+    if request.parking_ids is None and request.bbox is None:
+        raise HTTPException(status_code=400, detail="parking_ids 또는 bbox가 필요합니다.")
+    
+    snapshot = get_data_snapshot()
+    parking_ids = request.parking_ids
+    if request.bbox is not None:
+        bbox = request.bbox
+        in_bbox = snapshot.lot_store.ids_within_bbox(bbox.min_lat, bbox.min_lon, bbox.max_lat, bbox.max_lon)
+        if parking_ids is None:
+            parking_ids = in_bbox
+        else:
+            in_bbox_set = set(in_bbox)
+            parking_ids = [pid for pid in parking_ids if pid in in_bbox_set]
+    
+    engine = snapshot.engine
+    
+    async def stream():
+        for start in range(0, len(parking_ids), BULK_PREDICTION_CHUNK):
+            chunk = parking_ids[start:start + BULK_PREDICTION_CHUNK]
+            results = await engine.generate_batch_predictions(chunk, request.hours_ahead)
+            for pid in chunk:
+                line = {"parking_id": pid, "predictions": results[pid]}
+                yield json.dumps(line, ensure_ascii=False) + "\n"
+            # 다음 묶음 계산 전에 이벤트 루프에 양보 (먼저 계산된 줄부터 전송)
+            await asyncio.sleep(0)
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.get("/predictions/features/{parking_id}")
+async def get_prediction_features(parking_id: str):
+    """예측에 쓰이는 주차장별 고정 특성 조회 (디버깅/검증용)"""
+    features = get_prediction_engine().get_lot_features(parking_id)
+    if not features:
+        raise HTTPException(status_code=404, detail="Parking lot not found")
+    return features._asdict()
+
+@app.get("/predictions/cache-stats")
+async def get_prediction_cache_stats():
+    engine = get_prediction_engine()
+    return {**engine.forecast_cache.stats(), "weather_version": engine.weather_version}
+
 @app.get("/weather")
 async def get_weather():
     # 실제 날씨 또는 캐시된 날씨 반환
@@ -824,6 +611,48 @@ async def get_weather():
         "pm25": 5
     }
 
+@app.get("/weather/hourly")
+async def get_hourly_weather(lat: float = CITY_CENTER[0], lon: float = CITY_CENTER[1]):
+    """좌표가 속한 격자의 시간별 단기예보"""
+    engine = get_prediction_engine()
+    await engine.update_extras()
+    series = engine.cell_series.get(map_to_grid(lat, lon))
+    return series.to_list() if series is not None else []
+
+@app.get("/weather/cells")
+async def get_weather_cells():
+    """주차장이 속한 기상청 격자 목록 (격자점 좌표, 주차장 수, 현재 날씨)"""
+    engine = get_prediction_engine()
+    await engine.update_extras()
+    lot_counts = np.bincount(engine.lot_arrays['cell'], minlength=len(engine.grid_cells))
+    cells = []
+    for i, (nx, ny) in enumerate(engine.grid_cells):
+        lat, lon = grid_to_latlon(nx, ny)
+        cells.append({
+            "nx": nx,
+            "ny": ny,
+            "latitude": round(lat, 6),
+            "longitude": round(lon, 6),
+            "parking_lots": int(lot_counts[i]),
+            "condition": engine._weather_condition((nx, ny)),
+        })
+    return cells
+
+@app.get("/weather/status")
+async def get_weather_status():
+    """날씨 갱신 상태 (마지막 성공 시각, 실패 횟수 등)"""
+    return weather_provider.stats()
+
+@app.get("/holidays/status")
+async def get_holiday_status():
+    """공휴일 달력 캐시 상태 (받아 둔 연도, 실패 횟수)"""
+    return holiday_calendar.stats()
+
+@app.get("/upstream/status")
+async def get_upstream_status():
+    """외부 API 호출 통계 및 호스트별 서킷 브레이커 상태"""
+    return upstream_client.stats()
+
 @app.get("/patterns/summary")
 async def get_patterns_summary():
     patterns = load_violation_patterns()
@@ -834,37 +663,112 @@ async def get_patterns_summary():
     }
 
 # Auth / Payments (기존 유지)
-@app.post("/auth/register", response_model=Token, status_code=status.HTTP_201_CREATED)
-def register_user(payload: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing: raise HTTPException(status_code=400, detail="이미 가입된 이메일입니다.")
-    user = User(email=payload.email, name=payload.name, password_hash=hash_password(payload.password))
+def _find_user(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+def _add_user(db: Session, payload: UserCreate, password_hash: str) -> User:
+    user = User(email=payload.email, name=payload.name, password_hash=password_hash)
     db.add(user)
     db.commit()
     db.refresh(user)
+    return user
+
+def _update_password_hash(db: Session, user: User, password_hash: str):
+    user.password_hash = password_hash
+    db.commit()
+
+async def _run_hasher(call):
+    """해시 작업 대기열이 가득 차면 503 (잠시 후 재시도)"""
+    try:
+        return await call
+    except HasherBusyError:
+        raise HTTPException(status_code=503, detail="요청이 많습니다. 잠시 후 다시 시도해 주세요.",
+                            headers={"Retry-After": "1"})
+
+# 해시 계산은 password_hasher 스레드에서, DB 조회는 요청 스레드풀에서 (이벤트 루프는 막지 않음)
+@app.post("/auth/register", response_model=Token, status_code=status.HTTP_201_CREATED)
+async def register_user(payload: UserCreate, db: Session = Depends(get_db)):
+    existing = await run_in_threadpool(_find_user, db, payload.email)
+    if existing: raise HTTPException(status_code=400, detail="이미 가입된 이메일입니다.")
+    password_hash = await _run_hasher(password_hasher.hash(payload.password))
+    user = await run_in_threadpool(_add_user, db, payload, password_hash)
     token = create_access_token({"sub": str(user.id), "email": user.email})
     return Token(access_token=token, user_id=user.id, email=user.email, name=user.name)
 
 @app.post("/auth/login", response_model=Token)
-def login_user(payload: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login_user(payload: UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_find_user, db, payload.email)
+    if not user:
         raise HTTPException(status_code=401, detail="로그인 실패")
+    valid, new_hash = await _run_hasher(password_hasher.verify_and_update(payload.password, user.password_hash))
+    if not valid:
+        raise HTTPException(status_code=401, detail="로그인 실패")
+    if new_hash:
+        # PASSWORD_HASH_ROUNDS가 바뀐 뒤 처음 로그인하면 새 설정으로 다시 저장
+        await run_in_threadpool(_update_password_hash, db, user, new_hash)
     token = create_access_token({"sub": str(user.id), "email": user.email})
     return Token(access_token=token, user_id=user.id, email=user.email, name=user.name)
 
+@app.get("/auth/hasher/status")
+async def get_password_hasher_status():
+    """비밀번호 해시 작업 풀 상태 (대기열, 거절 수, 대기/계산 시간 분포)"""
+    return password_hasher.stats()
+
+# create_all은 이미 있는 테이블에 새 인덱스를 추가하지 않으므로 따로 만든다 (있으면 건너뜀)
+MIGRATED_TABLES = (PaymentHistory.__table__,)
+
+def migrate_indexes():
+    for table in MIGRATED_TABLES:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 @app.on_event("startup")
 def on_startup():
     try:
         print(f"Connecting to database: {DATABASE_URL[:20]}...")
         Base.metadata.create_all(bind=engine)
+        migrate_indexes()
         print("Database connection & migration successful.")
     except Exception as e:
         print(f"Database connection failed during startup: {e}")
         print("The server will continue to run using local data files if available.")
         
-    load_parking_lots()
-    load_violation_patterns()
+    get_data_snapshot()
+
+_data_watcher: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_background_tasks():
+    global _data_watcher
+    weather_provider.start()
+    holiday_calendar.start()
+    if DATA_RELOAD_INTERVAL > 0:
+        _data_watcher = asyncio.create_task(watch_data_files())
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await weather_provider.stop()
+    await holiday_calendar.stop()
+    await upstream_client.aclose()
+    password_hasher.shutdown()
+    if _data_watcher:
+        _data_watcher.cancel()
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+@app.post("/admin/reload")
+async def admin_reload(request: Request):
+    """주차장/패턴 데이터 즉시 재로드 (ADMIN_TOKEN 필요)"""
+    if not ADMIN_TOKEN or request.headers.get("x-admin-token") != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="권한이 없습니다.")
+    reloaded = await reload_data(force=True)
+    snapshot = get_data_snapshot()
+    return {
+        "reloaded": reloaded,
+        "version": snapshot.version,
+        "loaded_at": snapshot.loaded_at.isoformat(),
+        "parking_lots": len(snapshot.columns)
+    }
 
 @app.post("/payments", response_model=PaymentOut, status_code=status.HTTP_201_CREATED)
 def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
@@ -878,11 +782,27 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
     db.refresh(record)
     return PaymentOut(id=record.id, parkingLotName=record.parking_lot_name, startTime=record.start_time, endTime=record.end_time, duration=record.duration, fee=record.fee, date=record.created_at.date().isoformat())
 
+HISTORY_PAGE_SIZE = 50
+HISTORY_PAGE_MAX = 100
+
 @app.get("/history", response_model=List[PaymentOut])
-def get_history(user_id: Optional[int] = None, db: Session = Depends(get_db)):
-    q = db.query(PaymentHistory).order_by(PaymentHistory.created_at.desc()).limit(50)
+def get_history(response: Response, user_id: Optional[int] = None, cursor: Optional[int] = None,
+                limit: int = HISTORY_PAGE_SIZE, db: Session = Depends(get_db)):
+    """결제 내역 (최신순). 다음 페이지가 있으면 X-Next-Cursor 헤더 값을 cursor로 넘긴다"""
+    if limit <= 0:
+        raise HTTPException(status_code=400, detail="limit은 0보다 커야 합니다.")
+    limit = min(limit, HISTORY_PAGE_MAX)
+    q = db.query(PaymentHistory)
     if user_id: q = q.filter(PaymentHistory.user_id == user_id)
-    return [PaymentOut(id=r.id, parkingLotName=r.parking_lot_name, startTime=r.start_time, endTime=r.end_time, duration=r.duration, fee=r.fee, date=r.created_at.date().isoformat()) for r in q.all()]
+    if cursor is not None:
+        # 커서는 이전 페이지 마지막 행의 id, 그 행의 created_at은 DB 안에서 읽어 저장된 값 그대로 비교
+        anchor = select(PaymentHistory.created_at).where(PaymentHistory.id == cursor).scalar_subquery()
+        q = q.filter(tuple_(PaymentHistory.created_at, PaymentHistory.id) < tuple_(anchor, cursor))
+    rows = q.order_by(PaymentHistory.created_at.desc(), PaymentHistory.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [PaymentOut(id=r.id, parkingLotName=r.parking_lot_name, startTime=r.start_time, endTime=r.end_time, duration=r.duration, fee=r.fee, date=r.created_at.date().isoformat()) for r in rows]
 
 @app.post("/vehicles", response_model=VehicleOut, status_code=status.HTTP_201_CREATED)
 def register_vehicle(payload: VehicleCreate, db: Session = Depends(get_db)):
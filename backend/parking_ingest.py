@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+천안시 주차장 정보 CSV -> parkingLots.json (백엔드 / Firebase Function / 프론트 공용)
+
+- CSV는 csv 모듈(RFC 4180: 따옴표 안의 쉼표/줄바꿈 처리)로 한 행씩 읽는다
+- 행마다 ParkingLotRecord 스키마로 검증하고, 통과하지 못한 행은 이유를 출력하고 건너뛴다
+- 주차장 ID는 관리번호 기반 하나의 규칙만 사용한다 (canonical_lot_id)
+- 백엔드/Function용 파일은 스키마 버전이 붙은 {"schemaVersion", "source", "lots"} 형식,
+  프론트 번들용 파일은 주차장 배열만 저장한다
+- 백엔드는 JSON 대신 같은 내용의 열 형식 파일(lot_columns, .npy)을 mmap으로 읽는다
+"""
+import codecs
+import csv
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError
+
+from lot_columns import LOTS_NPY, LotColumns
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+CSV_FILE = PROJECT_ROOT / "충청남도_천안시_주차장정보_20251128.csv"
+BACKEND_JSON = PROJECT_ROOT / "backend" / "parkingLots.json"
+FUNCTIONS_JSON = PROJECT_ROOT / "functions" / "parkingLots.json"
+FRONTEND_JSON = PROJECT_ROOT / "src" / "app" / "data" / "parkingLots.json"
+
+SCHEMA_VERSION = 1
+
+ENCODINGS = ['utf-8-sig', 'cp949', 'euc-kr']
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+
+# ===== 스키마 =====
+class FeeRecord(BaseModel):
+    type: str                   # 유료/무료
+    basic: int = Field(0, ge=0)
+    basicTime: int = Field(0, ge=0)
+    additional: int = Field(0, ge=0)
+    additionalTime: int = Field(0, ge=0)
+    daily: int = Field(0, ge=0)
+    monthly: int = Field(0, ge=0)
+    gracePeriod: int = Field(0, ge=0)   # 무료 회차 시간(분)
+
+
+class ParkingLotRecord(BaseModel):
+    id: str
+    managementNo: str
+    name: str = Field(..., min_length=1)
+    type: str                   # public/private
+    parkingType: str            # 노외/노상/부설
+    address: str
+    totalSpaces: int = Field(..., ge=0)
+    availableSpaces: Optional[int] = None   # 실시간 정보 없음 (예측값 사용)
+    operatingHours: str
+    fee: FeeRecord
+    feeInfo: str
+    paymentMethods: str
+    latitude: float = Field(..., ge=33.0, le=39.0)
+    longitude: float = Field(..., ge=124.0, le=132.0)
+    hasDisabledParking: bool
+    facilities: List[str]
+    managingOrg: str
+    phone: str
+    dataDate: str
+
+
+def _record_dict(record: BaseModel) -> Dict[str, Any]:
+    dump = getattr(record, 'model_dump', None)     # pydantic v2
+    return dump() if dump else record.dict()
+
+
+# ===== CSV 읽기 =====
+def detect_encoding(path: Path) -> Optional[str]:
+    """파일 앞부분만 읽어서 인코딩 판별 (판별 실패 시 None)"""
+    with open(path, 'rb') as f:
+        sample = f.read(ENCODING_SAMPLE_BYTES)
+    for encoding in ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def read_csv_rows(path: Path) -> Iterator[Tuple[Dict[str, str], int]]:
+    """CSV를 한 행씩 (dict, 헤더보다 넘치는 값 개수)로 (따옴표 안의 줄바꿈은 한 필드로 유지)"""
+    encoding = detect_encoding(path)
+    if encoding is None:
+        raise ValueError(f"인코딩을 판별할 수 없습니다: {path}")
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # 필드가 모자란 행은 None, 넘치는 값은 None 키로 들어오므로 정리
+            extra = row.pop(None, None) or []
+            yield {key: (value or '').strip() for key, value in row.items()}, len(extra)
+
+
+# ===== 필드 정리 =====
+def clean_int(s: str) -> int:
+    """숫자 변환 (실패 시 0, "12.0"/"1,000" 허용)"""
+    s = re.sub(r'[^-0-9.]', '', s or '')
+    try:
+        return int(float(s)) if s else 0
+    except ValueError:
+        return 0
+
+
+def clean_float(s: str) -> float:
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def format_time(time_str: str) -> str:
+    """HHMM -> HH:MM 형식 변환 (이미 HH:MM이면 그대로)"""
+    if ":" in time_str:
+        return time_str
+    if not time_str or not time_str.isdigit():
+        return ""
+    time_str = time_str.zfill(4)
+    return f"{time_str[:2]}:{time_str[2:]}"
+
+
+def parse_operating_hours(row: Dict[str, str]) -> str:
+    hours = []
+    for label, start_col, end_col, missing in (
+        ('평일', '평일운영시작시각', '평일운영종료시각', None),
+        ('토요일', '토요일운영시작시각', '토요일운영종료시각', '토요일 휴무/정보없음'),
+        ('공휴일', '공휴일운영시작시각', '공휴일운영종료시각', '공휴일 휴무/정보없음'),
+    ):
+        start, end = format_time(row.get(start_col, '')), format_time(row.get(end_col, ''))
+        if start and end:
+            hours.append(f"{label} {start}~{end}")
+        elif missing:
+            hours.append(missing)
+    return " / ".join(hours)
+
+
+def parse_facilities(row: Dict[str, str], is_public: bool) -> List[str]:
+    """편의시설 (장애인전용주차구역 여부, 특기사항 키워드, 결제방법)"""
+    notes = row.get('특기사항', '')
+    facilities = []
+    if row.get('장애인전용주차구역보유여부') == 'Y' or '장애인' in notes:
+        facilities.append("장애인 주차")
+    for keywords, label in (
+        (('전기차', '충전'), "전기차 충전"),
+        (('경차',), "경차 전용"),
+        (('임산부',), "임산부 전용"),
+        (('화장실',), "화장실"),
+        (('엘리베이터', '승강기'), "엘리베이터"),
+        (('시장',), "시장 할인"),
+        (('무료',), "무료 주차"),
+    ):
+        if any(k in notes for k in keywords):
+            facilities.append(label)
+    if '카드' in row.get('결제방법', ''):
+        facilities.append("카드 결제")
+    if is_public:
+        facilities.append("공영 주차")
+    return facilities
+
+
+# 추가요금 열이 특기사항과 다르게 들어간 주차장 (특기사항 기준으로 보정)
+FEE_NOTE_OVERRIDES = {
+    '불당 제5공영주차장': ('10분마다 200원', 200, 10),
+}
+
+
+def parse_fee(row: Dict[str, str]) -> FeeRecord:
+    basic_time = clean_int(row.get('주차기본시간'))
+    basic_fee = clean_int(row.get('주차기본요금'))
+    add_time = clean_int(row.get('추가단위시간'))
+    add_fee = clean_int(row.get('추가단위요금'))
+    notes = row.get('특기사항', '')
+
+    # 기본요금이 0이면 기본시간 동안 무료, 특기사항에 "최초/회차 N분 무료"가 있으면 그 값
+    grace_period = basic_time if basic_fee == 0 and basic_time > 0 else 0
+    match = re.search(r'(?:최초|회차)\s*(\d+)분\s*무료', notes)
+    if match:
+        grace_period = int(match.group(1))
+
+    override = FEE_NOTE_OVERRIDES.get(row.get('주차장명', ''))
+    if override and override[0] in notes:
+        add_fee, add_time = override[1], override[2]
+
+    return FeeRecord(
+        type=row.get('요금정보', ''),
+        basic=basic_fee,
+        basicTime=basic_time,
+        additional=add_fee,
+        additionalTime=add_time,
+        daily=clean_int(row.get('1일주차권요금')),
+        monthly=clean_int(row.get('월정기권요금')),
+        gracePeriod=grace_period,
+    )
+
+
+# ===== ID =====
+def _short_hash(*parts: str, size: int = 4) -> str:
+    return hashlib.blake2b('|'.join(parts).encode('utf-8'), digest_size=size).hexdigest()
+
+
+def canonical_lot_id(management_no: str, name: str, address: str, taken: set) -> str:
+    """주차장 ID: 'P' + 관리번호 숫자 (예: 301-2-000014 -> P3012000014)
+
+    관리번호가 없으면 이름/주소 해시, 같은 관리번호가 이미 쓰였으면 뒤에 이름/주소 해시를 붙인다.
+    """
+    digits = re.sub(r'\D', '', management_no)
+    lot_id = f"P{digits}" if digits else f"PX{_short_hash(name, address)}"
+    if lot_id in taken:
+        lot_id = f"{lot_id}-{_short_hash(name, address, size=3)}"
+    taken.add(lot_id)
+    return lot_id
+
+
+# ===== 변환 =====
+def parse_row(row: Dict[str, str], taken_ids: set) -> ParkingLotRecord:
+    p_type = 'public' if '공영' in row.get('주차장구분', '') else 'private'
+    address = row.get('소재지도로명주소') or row.get('소재지지번주소', '')
+    management_no = row.get('주차장관리번호', '')
+    name = row.get('주차장명', '')
+    record = ParkingLotRecord(
+        id='',
+        managementNo=management_no,
+        name=name,
+        type=p_type,
+        parkingType=row.get('주차장유형', ''),
+        address=address,
+        totalSpaces=clean_int(row.get('주차구획수')),
+        operatingHours=parse_operating_hours(row),
+        fee=parse_fee(row),
+        feeInfo=row.get('특기사항', ''),
+        paymentMethods=row.get('결제방법', ''),
+        latitude=clean_float(row.get('위도')),
+        longitude=clean_float(row.get('경도')),
+        hasDisabledParking=row.get('장애인전용주차구역보유여부') == 'Y',
+        facilities=parse_facilities(row, p_type == 'public'),
+        managingOrg=row.get('관리기관명', ''),
+        phone=row.get('전화번호', ''),
+        dataDate=row.get('데이터기준일자', ''),
+    )
+    # 검증을 통과한 행에만 ID를 배정 (건너뛴 행이 ID를 차지하지 않도록)
+    record.id = canonical_lot_id(management_no, name, address, taken_ids)
+    return record
+
+
+def ingest(csv_file: Path = CSV_FILE) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """CSV -> (주차장 목록, 출처 정보)"""
+    lots, skipped, taken_ids = [], 0, set()
+    rows = 0
+    for rows, (row, extra) in enumerate(read_csv_rows(csv_file), start=1):
+        if extra:
+            # 열이 밀린 행은 어느 값이 어느 열인지 알 수 없으므로 건너뜀
+            skipped += 1
+            print(f"⚠️ {rows}번째 행 건너뜀 ({row.get('주차장명') or '이름 없음'}): 열 개수 초과 ({extra}개)")
+            continue
+        try:
+            lots.append(_record_dict(parse_row(row, taken_ids)))
+        except ValidationError as e:
+            skipped += 1
+            fields = ', '.join('.'.join(str(p) for p in err['loc']) for err in e.errors())
+            print(f"⚠️ {rows}번째 행 건너뜀 ({row.get('주차장명') or '이름 없음'}): {fields}")
+
+    with open(csv_file, 'rb') as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+    source = {'file': csv_file.name, 'sha256': sha256, 'rows': rows, 'skipped': skipped}
+    return lots, source
+
+
+def write_outputs(lots: List[Dict[str, Any]], source: Dict[str, Any]):
+    envelope = {'schemaVersion': SCHEMA_VERSION, 'source': source, 'lots': lots}
+    for path, data in ((BACKEND_JSON, envelope), (FUNCTIONS_JSON, envelope), (FRONTEND_JSON, lots)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"✅ {path.relative_to(PROJECT_ROOT)} 저장 완료")
+    # JSON보다 나중에 저장 (백엔드는 열 파일이 JSON보다 오래됐으면 JSON을 읽음)
+    LotColumns.from_lots(lots, {'schemaVersion': SCHEMA_VERSION, 'source': source}).save()
+    print(f"✅ {LOTS_NPY.relative_to(PROJECT_ROOT)} 외 열 형식 파일 저장 완료")
+
+
+def load_lots(path: Path) -> List[Dict[str, Any]]:
+    """parkingLots.json 읽기 (버전 형식과 예전 배열 형식 모두 허용)"""
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    version = data.get('schemaVersion', 0)
+    if version > SCHEMA_VERSION:
+        print(f"⚠️ {path.name} schemaVersion {version} > 지원 버전 {SCHEMA_VERSION}")
+    return data.get('lots', [])
+
+
+def run():
+    print("🚗 천안시 주차장 CSV 파싱 시작...")
+    lots, source = ingest()
+    print(f"✅ {source['rows']}행 중 {len(lots)}개 주차장 변환 (건너뜀 {source['skipped']}개)")
+    write_outputs(lots, source)
+
+
+if __name__ == "__main__":
+    run()
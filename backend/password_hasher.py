@@ -0,0 +1,126 @@
+"""
+비밀번호 해시/검증 전용 작업 풀
+- pbkdf2 계산(수십 ms)을 요청 스레드풀/이벤트 루프 밖의 전용 스레드에서 실행 (hashlib은 계산 중 GIL을 놓음)
+- 실행 중 + 대기 중인 작업 수에 상한을 두고, 넘치면 바로 거절 (HasherBusyError -> 503)
+- 대기/계산 시간 분포를 stats()로 노출
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+LATENCY_WINDOW = 1000   # 최근 몇 건으로 백분위를 계산할지
+
+
+class HasherBusyError(Exception):
+    """대기열이 가득 차서 작업을 받지 않음"""
+
+
+def _percentiles(samples) -> Dict[str, float]:
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "p50_ms": round(pick(0.50) * 1000, 2),
+        "p95_ms": round(pick(0.95) * 1000, 2),
+        "p99_ms": round(pick(0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+class PasswordHasher:
+    def __init__(self, max_workers: int = 2, max_queue: int = 32, rounds: Optional[int] = None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        settings = {"pbkdf2_sha256__rounds": rounds} if rounds else {}
+        # rounds를 바꿔도 기존 해시는 해시 안에 적힌 rounds로 검증되고, 로그인 시 새 설정으로 다시 해시된다
+        self.context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto", **settings)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0        # 실행 중 + 대기 중
+        self.running = 0
+        self.completed = {"hash": 0, "verify": 0}
+        self.rejected = 0
+        self.errors = 0
+        self._wait_times = deque(maxlen=LATENCY_WINDOW)   # 초
+        self._run_times = deque(maxlen=LATENCY_WINDOW)
+
+    # ===== 동기 API (작업 스레드에서 실행) =====
+    def hash_sync(self, password: str) -> str:
+        return self.context.hash(password)
+
+    def verify_and_update_sync(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """(일치 여부, 설정이 바뀌었으면 새 해시 아니면 None)"""
+        return self.context.verify_and_update(password, hashed)
+
+    # ===== 비동기 API (요청 경로) =====
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", self.hash_sync, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        return await self._submit("verify", self.verify_and_update_sync, password, hashed)
+
+    async def _submit(self, kind: str, fn: Callable, *args) -> Any:
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise HasherBusyError(f"password hasher queue full ({self.pending})")
+            self.pending += 1
+        queued_at = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            with self._lock:
+                self.running += 1
+            try:
+                result = fn(*args)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                raise
+            else:
+                with self._lock:
+                    self.completed[kind] += 1
+                return result
+            finally:
+                # 요청이 먼저 끊겨도 계산이 끝날 때까지는 대기열 자리를 차지한다
+                with self._lock:
+                    self.running -= 1
+                    self.pending -= 1
+                    self._wait_times.append(started - queued_at)
+                    self._run_times.append(time.perf_counter() - started)
+
+        try:
+            future = self._executor.submit(run)
+        except RuntimeError:
+            with self._lock:
+                self.pending -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "scheme": "pbkdf2_sha256",
+                "rounds": self.context.handler("pbkdf2_sha256").default_rounds,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.pending - self.running,
+                "completed": dict(self.completed),
+                "rejected": self.rejected,
+                "errors": self.errors,
+                "wait": _percentiles(self._wait_times),
+                "run": _percentiles(self._run_times),
+            }
@@ -0,0 +1,513 @@
+"""
+가중치 기반 주차장 혼잡도 예측 엔진
+백엔드(backend/main.py)와 Cloud Function(functions/api_predictions.py)이 같은 코드를 사용한다.
+날씨/공휴일은 밖에서 넘겨받고, 없으면 기본 날씨와 주말만 휴일로 계산한다.
+"""
+import math
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+import jitter
+from forecast_cache import ForecastCache
+from holiday_calendar import HolidayCalendar
+from hotspot_density import HotspotDensity, area_coords, build_from_counts, extract_dong_from_address
+from kma_grid import map_to_grid_array
+from violation_counts import load_dong_tensor
+from weather_provider import WET_PTY, WeatherProvider, WeatherSeries
+
+CITY_CENTER = (36.815, 127.113)  # 천안시 대표 좌표 (날씨 조회 기준)
+
+def get_kst_now():
+    """서버 시간(UTC)을 한국 시간(KST)으로 변환"""
+    return datetime.utcnow() + timedelta(hours=9)
+
+def load_hotspot_density(patterns: Dict, lots: List[Dict]) -> HotspotDensity:
+    """저장된 단속 밀도 격자 (없으면 패턴의 동별 건수로 즉석에서 생성)"""
+    hotspots = HotspotDensity.load()
+    if hotspots is None:
+        counts = {dong: data.get('count', 0) for dong, data in patterns.get('by_dong', {}).items()}
+        hotspots = HotspotDensity(*build_from_counts(counts, area_coords(lots)))
+    return hotspots
+
+# 날씨를 아직 한 번도 받지 못했을 때 사용하는 기본값 (영하임을 표시하기 위해 -10도)
+FALLBACK_WEATHER = {
+    "temperature": -10,
+    "condition": "cloudy",
+    "weather_score": 0,
+    "air_quality": "보통",
+    "pm10": 35,
+    "pm25": 18
+}
+
+# ===== 가중치 기반 예측 엔진 =====
+FORECAST_CACHE_SIZE = int(os.getenv("FORECAST_CACHE_SIZE", "2048"))   # (주차장 목록 × 예측 시간대) 행렬 수
+FORECAST_CACHE_TTL = int(os.getenv("FORECAST_CACHE_TTL", "3600"))     # 초
+FORECAST_HORIZON_HOURS = 72   # 예측 가능한 최대 시간 (기상청 단기예보 범위)
+
+class LotFeatures(NamedTuple):
+    """요청과 무관하게 고정된 주차장별 예측 입력값 (엔진 생성/재로드 시 한 번 계산)"""
+    parking_id: str
+    dong: str
+    parking_type: str           # 노외/노상/부설
+    location_weight: float
+    proximity_weight: float
+    fee_weight: float
+    capacity_weight: float
+    is_attached: bool           # 부설(건물 내) 여부, 비/눈 올 때 선호
+    grid: Tuple[int, int]       # 기상청 격자 (nx, ny), 해당 격자 날씨를 사용
+    confidence: float
+    profile: int                # 시간/요일 가중치 테이블 행 (0 = 시 전체)
+
+class PredictionEngine:
+    
+    WEIGHTS = {
+        'hourly': 0.25,
+        'daily': 0.10,
+        'location': 0.15,
+        'proximity': 0.15,  # 신규: 인근 불법주정차 핫스팟 밀도
+        'fee': 0.10,
+        'capacity': 0.10,
+        'weather': 0.10,
+        'holiday': 0.05
+    }
+    
+    # 동별 시간/요일 분포를 시 전체 분포와 섞을 때 시 전체 쪽에 주는 가상 건수
+    # (단속 건수가 적은 동일수록 시 전체 분포에 가까워짐)
+    DONG_PROFILE_PRIOR = 1000
+    
+    def __init__(self, parking_lots: List[Dict], patterns: Dict,
+                 weather: Optional[WeatherProvider] = None, holidays: Optional[HolidayCalendar] = None,
+                 hotspots: Optional[HotspotDensity] = None,
+                 dong_tensor: Optional[Tuple[List[str], np.ndarray]] = None):
+        self.patterns = patterns
+        lots = parking_lots
+        lots_by_id = {lot['id']: lot for lot in lots}   # 특성 계산에만 쓰고 보관하지 않음
+        self.weather = weather      # None이면 FALLBACK_WEATHER
+        self.hotspots = hotspots if hotspots is not None else load_hotspot_density(self.patterns, lots)
+        self._build_time_profiles(dong_tensor if dong_tensor is not None else load_dong_tensor())
+        
+        # 캐싱된 날씨/휴일 (메모리)
+        self.cached_weather = None  # 대표 좌표 날씨
+        self.cell_weather: Dict[Tuple[int, int], Dict] = {}  # 격자별 날씨
+        self.cell_series: Dict[Tuple[int, int], WeatherSeries] = {}  # 격자별 시간별 예보
+        self.weather_source_version = -1  # 마지막으로 반영한 weather provider 버전
+        self.holidays = holidays    # None이면 주말만 휴일
+        self.weather_version = 0  # 날씨가 바뀔 때마다 증가 (예측 캐시 키)
+        
+        # 가중합 결과 캐시: (주차장, 예측 시각, 날씨 버전, 휴일 여부) -> Live 변동 전 점유율
+        self.forecast_cache = ForecastCache(FORECAST_CACHE_SIZE, FORECAST_CACHE_TTL)
+        
+        # 주차장별 정적 특성 (레코드 + 배치 예측용 배열)
+        grids = self._lot_grids(list(lots_by_id.values()))
+        self.lot_features: Dict[str, LotFeatures] = {
+            pid: self._build_lot_features(pid, lot, grid)
+            for (pid, lot), grid in zip(lots_by_id.items(), grids)
+        }
+        self._build_lot_arrays()
+        self._refresh_cell_wet()
+
+    @staticmethod
+    def _lot_grids(lots: List[Dict]) -> List[Tuple[int, int]]:
+        """주차장 좌표 -> 기상청 격자 (한 번에 변환, 좌표가 없으면 대표 좌표 격자)"""
+        has_coords = [bool(lot.get('latitude') and lot.get('longitude')) for lot in lots]
+        lats = [lot['latitude'] if ok else CITY_CENTER[0] for lot, ok in zip(lots, has_coords)]
+        lons = [lot['longitude'] if ok else CITY_CENTER[1] for lot, ok in zip(lots, has_coords)]
+        nx, ny = map_to_grid_array(lats, lons)
+        return list(zip(nx.tolist(), ny.tolist()))
+
+    def _build_lot_features(self, parking_id: str, lot: Dict, grid: Tuple[int, int]) -> LotFeatures:
+        dong = extract_dong_from_address(lot.get('address', ''))
+        p_type = lot.get('parkingType', '') or ''
+        return LotFeatures(
+            parking_id=parking_id,
+            dong=dong,
+            parking_type=p_type,
+            location_weight=self.get_location_weight(dong),
+            proximity_weight=self.get_proximity_weight(lot.get('latitude'), lot.get('longitude')),
+            fee_weight=self.get_fee_weight(lot.get('fee', {}).get('type', '무료')),
+            capacity_weight=self.get_capacity_weight(lot.get('totalSpaces', 50)),
+            is_attached='부설' in p_type,
+            confidence=self._calculate_confidence(dong, 0),
+            grid=grid,
+            profile=self.profile_index.get(dong, 0),
+        )
+
+    def get_lot_features(self, parking_id: str) -> Optional[LotFeatures]:
+        return self.lot_features.get(parking_id)
+
+    def _build_lot_arrays(self):
+        """LotFeatures를 주차장 순서(self.lot_ids)대로 배열로 펼침"""
+        self.lot_ids = list(self.lot_features.keys())
+        self.lot_index = {pid: i for i, pid in enumerate(self.lot_ids)}
+        features = list(self.lot_features.values())
+        
+        self.lot_arrays = {
+            'location': np.array([f.location_weight for f in features], dtype=np.float64),
+            'proximity': np.array([f.proximity_weight for f in features], dtype=np.float64),
+            'fee': np.array([f.fee_weight for f in features], dtype=np.float64),
+            'capacity': np.array([f.capacity_weight for f in features], dtype=np.float64),
+            'is_attached': np.array([f.is_attached for f in features], dtype=bool),
+            'confidence': np.array([f.confidence for f in features], dtype=np.float64),
+            'profile': np.array([f.profile for f in features], dtype=np.intp),
+        }
+        
+        # 주차장 -> 격자 번호 (self.grid_cells 기준)
+        self.grid_cells = sorted({f.grid for f in features})
+        cell_index = {cell: i for i, cell in enumerate(self.grid_cells)}
+        self.lot_arrays['cell'] = np.array([cell_index[f.grid] for f in features], dtype=np.intp)
+        
+        # 재현 가능한 변동 테이블 (주차장 × 시): 현재 시각 기준 Live 변동(-3~3), 예측 시간대별 변동(-5~5)
+        self.lot_arrays['live_noise'] = jitter.lot_noise_table(self.lot_ids, jitter.STREAM_LIVE, -3, 3)
+        self.lot_arrays['hour_noise'] = jitter.lot_noise_table(self.lot_ids, jitter.STREAM_HOUR, -5, 5)
+
+    def inherit_extras(self, other: "PredictionEngine"):
+        """데이터 재로드 시 이전 엔진의 날씨/휴일 캐시를 이어받음 (API 재호출 방지)"""
+        self.cached_weather = other.cached_weather
+        self.cell_weather = other.cell_weather
+        self.cell_series = other.cell_series
+        self.weather_source_version = other.weather_source_version
+        self.weather_version = other.weather_version
+        self._refresh_cell_wet()
+
+    async def update_extras(self):
+        """날씨 및 휴일 정보 반영 (날씨는 weather provider 캐시만 읽고 API를 기다리지 않음)"""
+        weather = self.weather.get() if self.weather is not None else None
+        if weather is not None:
+            if self.weather.version != self.weather_source_version:
+                self.cached_weather = weather['city']
+                self.cell_weather = weather['cells']
+                self.cell_series = weather.get('series', {})
+                self.weather_source_version = self.weather.version
+                self._on_weather_changed()
+        elif not self.cached_weather:
+            # 아직 날씨를 받지 못함 (갱신은 백그라운드에서 진행 중)
+            self.cached_weather = dict(FALLBACK_WEATHER)
+            self._on_weather_changed()
+
+    def _on_weather_changed(self):
+        self.weather_version += 1
+        self.forecast_cache.clear()
+        self._refresh_cell_wet()
+
+    def _weather_condition(self, grid: Optional[Tuple[int, int]] = None) -> str:
+        """격자 날씨 상태 (격자 날씨가 없으면 대표 좌표 날씨)"""
+        weather = self.cell_weather.get(grid) or self.cached_weather or {}
+        return weather.get('condition', 'sunny')
+
+    def _refresh_cell_wet(self):
+        """격자별 현재 날씨의 비/눈 여부 (예보 범위 밖 시각에 사용)"""
+        self._cell_wet = np.array([self._weather_condition(cell) in ['rainy', 'snowy'] for cell in self.grid_cells],
+                                  dtype=bool)
+
+    def _cell_wet_matrix(self, target_times: List[datetime]) -> np.ndarray:
+        """(격자 × 예측 시각) 비/눈 여부, 예보 범위 밖의 시각은 현재 날씨로 채움"""
+        wet = np.repeat(self._cell_wet[:, None], len(target_times), axis=1)
+        for c, cell in enumerate(self.grid_cells):
+            series = self.cell_series.get(cell)
+            if series is None:
+                continue
+            offsets = series.offsets(target_times)
+            covered = offsets >= 0
+            wet[c, covered] = np.isin(series.pty[offsets[covered]], WET_PTY)
+        return wet
+
+    def weather_weight_matrix(self, idx: np.ndarray, target_times: List[datetime]) -> np.ndarray:
+        """get_weather_weight의 (주차장 × 예측 시각) 배열 버전, idx는 self.lot_ids 기준 위치"""
+        if not len(self.grid_cells):
+            return np.ones((len(idx), len(target_times)))
+        lot_wet = self._cell_wet_matrix(target_times)[self.lot_arrays['cell'][idx]]
+        return np.where(lot_wet, np.where(self.lot_arrays['is_attached'][idx][:, None], 1.2, 0.8), 1.0)
+
+    def _build_time_profiles(self, dong_tensor: Optional[Tuple[List[str], np.ndarray]]):
+        """시간/요일 가중치 테이블 (0행은 시 전체, 1행부터 동별)
+
+        동별 분포는 [동, 요일, 시] 단속 건수 텐서에서 구하고, 건수가 적은 동은 시 전체 분포 쪽으로 당긴다.
+        """
+        city_hourly = np.array([self.get_hourly_weight(h) for h in range(24)], dtype=np.float64)
+        city_daily = np.array([self.get_daily_weight(w) for w in range(7)], dtype=np.float64)
+        self.profile_index: Dict[str, int] = {}
+        self.hourly_table = city_hourly[None, :]
+        self.daily_table = city_daily[None, :]
+        if not dong_tensor:
+            return
+        
+        dongs, counts = dong_tensor
+        counts = counts.astype(np.float64)
+        by_hour = counts.sum(axis=1)                # [동, 시]
+        by_day = counts.sum(axis=2)                 # [동, 요일]
+        n = by_hour.sum(axis=1)
+        keep = n > 0
+        if not keep.any():
+            return
+        by_hour, by_day, n = by_hour[keep], by_day[keep], n[keep][:, None]
+        prior = self.DONG_PROFILE_PRIOR
+        hourly = (n * by_hour / by_hour.max(axis=1, keepdims=True) + prior * city_hourly) / (n + prior)
+        daily = (n * by_day / by_day.max(axis=1, keepdims=True) + prior * city_daily) / (n + prior)
+        
+        self.hourly_table = np.vstack([city_hourly, hourly])
+        self.daily_table = np.vstack([city_daily, daily])
+        kept = [dong for dong, k in zip(dongs, keep) if k]
+        self.profile_index = {dong: i + 1 for i, dong in enumerate(kept)}
+
+    def get_hourly_weight(self, hour: int) -> float:
+        if not self.patterns or 'hourly' not in self.patterns:
+            return 0.5
+        return self.patterns['hourly'].get(str(hour), {}).get('weight', 0.5)
+    
+    def get_daily_weight(self, weekday: int) -> float:
+        if not self.patterns or 'daily' not in self.patterns:
+            return 0.85
+        return self.patterns['daily'].get(str(weekday), {}).get('weight', 0.85)
+    
+    def get_location_weight(self, dong: str) -> float:
+        if not self.patterns or 'by_dong' not in self.patterns:
+            return 0.5
+        return self.patterns['by_dong'].get(dong, {}).get('weight', 0.3)
+    
+    def get_fee_weight(self, fee_type: str) -> float:
+        return 1.2 if fee_type == '무료' else 0.8
+    
+    def get_capacity_weight(self, total_spaces: int) -> float:
+        return 0.8 if total_spaces >= 100 else 1.1
+
+    def get_weather_weight(self, parking_type: str, grid: Optional[Tuple[int, int]] = None,
+                           when: Optional[datetime] = None) -> float:
+        """날씨에 따른 주차장 선호도 (실내/실외)
+
+        grid가 있으면 해당 격자 날씨 기준, when이 예보 범위 안이면 그 시각의 예보 기준
+        """
+        if not self.cached_weather and not self.cell_weather:
+            return 1.0
+        
+        series = self.cell_series.get(grid) if when is not None else None
+        cond = (series.condition_at(when) if series is not None else None) or self._weather_condition(grid)
+        # 비/눈 올 때: 실내(indoor/building) 선호, 노외/노상(outdoor) 비선호
+        if cond in ['rainy', 'snowy']:
+            # parkingType: '노외', '노상', '부설' 등
+            if parking_type and '부설' in parking_type: # 보통 건물 내
+                return 1.2
+            else:
+                return 0.8
+        return 1.0 # 맑음
+
+    def is_holiday(self, day: date) -> bool:
+        if self.holidays is None:
+            return day.weekday() >= 5
+        return self.holidays.is_holiday(day)
+
+    def get_holiday_weight(self, is_holiday: bool) -> float:
+        """휴일 여부"""
+        return 1.2 if is_holiday else 0.9
+
+    def get_proximity_weight(self, lat: float, lon: float) -> float:
+        """인근 불법주정차 단속 밀도에 따른 가중치 (밀도 격자 조회, 1.0 ~ 1.3)"""
+        if not lat or not lon:
+            return 1.0
+        return 1.0 + 0.3 * self.hotspots.lookup(lat, lon)
+
+    async def calculate_occupancy(
+        self,
+        parking_id: str,
+        target_time: datetime
+    ) -> tuple:
+        await self.update_extras()
+        
+        features = self.lot_features.get(parking_id)
+        if not features:
+            return 50.0, 60.0, {}
+        
+        hour = target_time.hour
+        weekday = target_time.weekday()
+        
+        # 가중치 계산 (주차장 고정 특성은 LotFeatures에서 가져옴, 시간/요일은 동별 분포)
+        hourly_w = float(self.hourly_table[features.profile, hour])
+        daily_w = float(self.daily_table[features.profile, weekday])
+        location_w = features.location_weight
+        fee_w = features.fee_weight
+        capacity_w = features.capacity_weight
+        weather_w = self.get_weather_weight(features.parking_type, features.grid, target_time)
+        holiday_w = self.get_holiday_weight(self.is_holiday(target_time.date()))
+        
+        # 종합 점수 (0-1)
+        weighted_score = (
+            hourly_w * self.WEIGHTS['hourly'] +
+            daily_w * self.WEIGHTS['daily'] +
+            location_w * self.WEIGHTS['location'] +
+            features.proximity_weight * self.WEIGHTS['proximity'] +
+            fee_w * self.WEIGHTS['fee'] +
+            capacity_w * self.WEIGHTS['capacity'] +
+            weather_w * self.WEIGHTS['weather'] +
+            holiday_w * self.WEIGHTS['holiday']
+        )
+        
+        # 현실적인 점유율 분포를 위한 보정 (기본 15% ~ 최대 95%)
+        base_occupancy = 15.0
+        occupancy = base_occupancy + (weighted_score * 80)
+        
+        # 요일/시간대에 따른 추가 무작위성 및 Live 변동 (Random Walk 시뮬레이션)
+        # 시간(분/초)에 따라 결정론적으로 변하게 하여 모든 사용자에게 동일하게 "움직이는" 데이터 제공
+        now = get_kst_now()
+        i = self.lot_index[parking_id]
+        
+        # 기본 랜덤 변동 (-3 ~ 3, 주차장/현재 시각마다 고정)
+        base_rand = float(self.lot_arrays['live_noise'][i, now.hour])
+        
+        # 실시간 "Live" 변동 (분 단위로 -1.5 ~ 1.5% 사이에서 출렁임)
+        # sin 함수를 이용해 부드러운 출렁임 구현
+        time_offset = math.sin(now.minute / 10 + now.second / 600) * 1.5
+        
+        occupancy += (base_rand + time_offset)
+        
+        # 요일/시간대에 따른 추가 무작위성 (신뢰도에 영향 없는 미세 변동)
+        occupancy += float(self.lot_arrays['hour_noise'][i, hour]) # 재현 가능한 변동
+        
+        occupancy = max(5, min(95, occupancy))
+        
+        confidence = features.confidence
+        
+        factors = {
+            'hourly': round(hourly_w, 3),
+            'location': round(location_w, 3),
+            'weather': round(weather_w, 3),
+            'holiday': round(holiday_w, 3)
+        }
+        
+        return round(occupancy, 1), round(confidence, 1), factors
+    
+    def base_scores(self, idx: np.ndarray, target_times: List[datetime]) -> np.ndarray:
+        """Live 변동을 더하기 전 점유율 (가중합 기반), idx는 self.lot_ids 기준 위치"""
+        hours = np.array([t.hour for t in target_times], dtype=np.intp)
+        weekdays = np.array([t.weekday() for t in target_times], dtype=np.intp)
+        profiles = self.lot_arrays['profile'][idx][:, None]
+        hourly_w = self.hourly_table[profiles, hours[None, :]]
+        daily_w = self.daily_table[profiles, weekdays[None, :]]
+        holiday_w = np.array([self.get_holiday_weight(self.is_holiday(t.date())) for t in target_times],
+                             dtype=np.float64)
+        arrays = self.lot_arrays
+        weather_w = self.weather_weight_matrix(idx, target_times)
+        
+        weighted_score = (
+            hourly_w * self.WEIGHTS['hourly'] +
+            daily_w * self.WEIGHTS['daily'] +
+            arrays['location'][idx][:, None] * self.WEIGHTS['location'] +
+            arrays['proximity'][idx][:, None] * self.WEIGHTS['proximity'] +
+            arrays['fee'][idx][:, None] * self.WEIGHTS['fee'] +
+            arrays['capacity'][idx][:, None] * self.WEIGHTS['capacity'] +
+            weather_w * self.WEIGHTS['weather'] +
+            holiday_w[None, :] * self.WEIGHTS['holiday']
+        )
+        return 15.0 + (weighted_score * 80)
+
+    def _cached_base_scores(self, parking_ids: List[str], idx: np.ndarray,
+                            target_times: List[datetime]) -> np.ndarray:
+        """base_scores를 예측 캐시에서 찾고, 없으면 행렬 전체를 계산해서 저장
+
+        행렬 계산 자체가 매우 빠르므로 칸/행 단위가 아니라 요청 행렬 하나를 키 하나로 캐시한다.
+        """
+        # 휴일 여부는 예측 시각의 날짜마다 다르므로 시간별 키에 포함
+        hour_keys = tuple(
+            (t.replace(minute=0, second=0, microsecond=0), self.is_holiday(t.date()))
+            for t in target_times
+        )
+        key = (tuple(parking_ids), hour_keys, self.weather_version)
+        base = self.forecast_cache.get(key)
+        if base is None:
+            base = self.base_scores(idx, target_times)
+            base.flags.writeable = False    # 캐시된 행렬은 여러 요청이 공유
+            self.forecast_cache.put(key, base)
+        return base
+
+    def score_matrix(self, parking_ids: List[str], target_times: List[datetime]) -> Tuple[np.ndarray, np.ndarray]:
+        """(주차장 × 시간) 점유율 행렬과 주차장별 신뢰도를 한 번에 계산
+
+        calculate_occupancy와 같은 순서로 가중합을 계산하므로 개별 호출과 동일한 값을 반환한다.
+        등록되지 않은 주차장은 calculate_occupancy와 마찬가지로 50.0 / 60.0으로 채운다.
+        """
+        n_hours = len(target_times)
+        known = np.array([pid in self.lot_index for pid in parking_ids], dtype=bool)
+        idx = np.array([self.lot_index.get(pid, 0) for pid in parking_ids], dtype=np.intp)
+        
+        occupancy = np.full((len(parking_ids), n_hours), 50.0)
+        confidence = np.full(len(parking_ids), 60.0)
+        if not self.lot_ids or not known.any() or n_hours == 0:
+            return occupancy, confidence
+        
+        scores = self._cached_base_scores(parking_ids, idx, target_times)
+        
+        # Live 변동 (calculate_occupancy와 같은 변동 테이블 사용)
+        hours = np.array([t.hour for t in target_times], dtype=np.intp)
+        now = get_kst_now()
+        base_rand = self.lot_arrays['live_noise'][idx, now.hour]
+        time_offset = math.sin(now.minute / 10 + now.second / 600) * 1.5
+        scores = scores + (base_rand[:, None] + time_offset)
+        scores = scores + self.lot_arrays['hour_noise'][idx[:, None], hours[None, :]]
+        scores = np.clip(scores, 5, 95)
+        
+        occupancy[known] = scores[known]
+        confidence[known] = self.lot_arrays['confidence'][idx[known]]
+        return occupancy, confidence
+
+    def _calculate_confidence(self, dong: str, hour: int) -> float:
+        base = 75.0
+        if not self.patterns: return 60.0
+        cnt = self.patterns.get('total_count', 0)
+        if cnt >= 50000: base += 10
+        if dong and dong in self.patterns.get('by_dong', {}):
+            d_cnt = self.patterns['by_dong'][dong].get('count', 0)
+            if d_cnt >= 1000: base += 8
+        return min(95.0, base)
+    
+    async def generate_predictions(
+        self,
+        parking_id: str,
+        hours_ahead: int = 24
+    ) -> List[Dict]:
+        results = await self.generate_batch_predictions([parking_id], hours_ahead)
+        return results[parking_id]
+
+    async def generate_batch_predictions(
+        self,
+        parking_ids: List[str],
+        hours_ahead: int = 24
+    ) -> Dict[str, List[Dict]]:
+        """여러 주차장의 시간대별 예측을 (주차장 × 시간) 행렬 한 번으로 계산"""
+        await self.update_extras()
+        
+        # 단기예보 시계열과 같은 한국 시간 기준으로 예측 시각 생성
+        now = get_kst_now()
+        target_times = [now + timedelta(hours=i+1) for i in range(hours_ahead)]
+        occupancy, confidence = self.score_matrix(parking_ids, target_times)
+        
+        idx = np.array([self.lot_index.get(pid, 0) for pid in parking_ids], dtype=np.intp)
+        weather_w = self.weather_weight_matrix(idx, target_times) if self.lot_ids else None
+        holiday_factors = [round(self.get_holiday_weight(self.is_holiday(t.date())), 3) for t in target_times]
+        hours = np.array([t.hour for t in target_times], dtype=np.intp)
+        hourly_w = self.hourly_table[self.lot_arrays['profile'][idx][:, None], hours[None, :]] if self.lot_ids else None
+        time_labels = [t.strftime('%H:00') for t in target_times]
+        
+        results = {}
+        for row, pid in enumerate(parking_ids):
+            i = self.lot_index.get(pid)
+            conf = round(float(confidence[row]), 1)
+            predictions = []
+            for col, label in enumerate(time_labels):
+                if i is None:
+                    factors = {}
+                else:
+                    factors = {
+                        'hourly': round(float(hourly_w[row, col]), 3),
+                        'location': round(float(self.lot_arrays['location'][i]), 3),
+                        'weather': round(float(weather_w[row, col]), 3),
+                        'holiday': holiday_factors[col]
+                    }
+                predictions.append({
+                    "time": label,
+                    "occupancy_rate": round(float(occupancy[row, col]), 1),
+                    "confidence": conf,
+                    "factors": factors
+                })
+            results[pid] = predictions
+        return results
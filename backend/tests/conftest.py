@@ -0,0 +1,9 @@
+"""
+백엔드 모듈은 backend/ 폴더를 기준으로 서로 import하므로 테스트에서도 같은 경로를 쓴다
+"""
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
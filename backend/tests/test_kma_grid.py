@@ -0,0 +1,33 @@
+"""
+기상청 격자 변환: 배열 버전이 스칼라 버전과 같은지, 격자점 좌표가 같은 격자로 돌아오는지
+"""
+import numpy as np
+
+from kma_grid import grid_to_latlon, map_to_grid, map_to_grid_array
+
+
+def test_array_matches_scalar():
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(33.0, 38.6, 5000)
+    lons = rng.uniform(124.5, 131.0, 5000)
+    nx, ny = map_to_grid_array(lats, lons)
+    expected = [map_to_grid(lat, lon) for lat, lon in zip(lats.tolist(), lons.tolist())]
+    assert list(zip(nx.tolist(), ny.tolist())) == expected
+
+
+def test_array_matches_scalar_on_cell_edges():
+    # 격자점 사이 중간(셀 경계) 좌표는 부동소수 오차로 스칼라와 달라지기 쉽다
+    cells = [(nx, ny) for nx in range(55, 75) for ny in range(100, 125)]
+    edges = [grid_to_latlon(nx + 0.5, ny + 0.5) for nx, ny in cells]
+    lats, lons = zip(*edges)
+    nx, ny = map_to_grid_array(lats, lons)
+    assert list(zip(nx.tolist(), ny.tolist())) == [map_to_grid(lat, lon) for lat, lon in edges]
+
+
+def test_grid_to_latlon_round_trip():
+    for cell in [(63, 110), (60, 127), (1, 1), (149, 253), (98, 76)]:
+        assert map_to_grid(*grid_to_latlon(*cell)) == cell
+    lats, lons = zip(*(grid_to_latlon(nx, ny) for nx in range(50, 80) for ny in range(100, 130)))
+    nx, ny = map_to_grid_array(lats, lons)
+    assert list(zip(nx.tolist(), ny.tolist())) == [(x, y) for x in range(50, 80) for y in range(100, 130)]
+
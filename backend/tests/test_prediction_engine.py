@@ -0,0 +1,60 @@
+"""
+예측 엔진: (주차장 × 시간) 행렬 배치 예측이 주차장/시각별 단건 계산과 같은 값을 내는지
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import prediction_engine
+from parking_ingest import load_lots
+from prediction_engine import FALLBACK_WEATHER, FORECAST_HORIZON_HOURS, PredictionEngine
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+NOW = datetime(2026, 5, 8, 13, 20)   # 금요일 (예측 구간에 주말이 들어가 휴일 가중치도 비교)
+HOURS = FORECAST_HORIZON_HOURS
+
+
+@pytest.fixture(scope='module')
+def engine():
+    lots = load_lots(BACKEND_DIR / 'parkingLots.json')
+    with open(BACKEND_DIR / 'violation_patterns.json', 'r', encoding='utf-8') as f:
+        patterns = json.load(f)
+    return PredictionEngine(lots, patterns)
+
+
+@pytest.mark.parametrize('condition', ['sunny', 'cloudy', 'rainy', 'snowy'])
+def test_batch_matches_scalar(engine, monkeypatch, condition):
+    monkeypatch.setattr(prediction_engine, 'get_kst_now', lambda: NOW)
+    engine.cached_weather = dict(FALLBACK_WEATHER, condition=condition)
+    engine._on_weather_changed()
+    parking_ids = engine.lot_ids + ['NO_SUCH_LOT']
+
+    async def run():
+        batch = await engine.generate_batch_predictions(parking_ids, HOURS)
+        mismatches = []
+        for pid in parking_ids:
+            for i in range(HOURS):
+                occupancy, confidence, factors = await engine.calculate_occupancy(pid, NOW + timedelta(hours=i + 1))
+                pred = batch[pid][i]
+                if (pred['occupancy_rate'], pred['confidence'], pred['factors']) != (occupancy, confidence, factors):
+                    mismatches.append((pid, i, pred, occupancy, confidence, factors))
+        return batch, mismatches
+
+    batch, mismatches = asyncio.run(run())
+    assert len(batch) == len(parking_ids)
+    assert all(len(preds) == HOURS for preds in batch.values())
+    assert mismatches == []
+
+
+def test_single_lot_matches_batch(engine, monkeypatch):
+    monkeypatch.setattr(prediction_engine, 'get_kst_now', lambda: NOW)
+    pid = engine.lot_ids[0]
+
+    async def run():
+        return await engine.generate_predictions(pid, 24), await engine.generate_batch_predictions(engine.lot_ids, 24)
+
+    single, batch = asyncio.run(run())
+    assert single == batch[pid]
@@ -0,0 +1,61 @@
+"""
+단속 건수: 파일을 나눠서 --append로 더한 결과가 한 번에 전체를 집계한 결과와 같은지
+"""
+import csv
+
+from violation_analyzer import patterns_from_counts, scan_files, update_counts
+from violation_counts import ViolationCounts
+
+HEADER = ['단속일자', '단속시간', '단속동', '단속장소']
+
+
+def write_csv(path, rows, encoding='utf-8'):
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return path
+
+
+def sample_files(tmp_path):
+    first = write_csv(tmp_path / 'a.csv', [
+        ['2024-01-02', '08:15', '성정동', ''],
+        ['2024-01-02', '18:40', '', '불당동 123-4'],
+        ['2024-03-09', '23:59', '두정동', ''],
+        ['2024-03-09', '', '', ''],                 # 시간/동 없음
+        ['bad-date', '07:00', '성정동', ''],         # 날짜 해석 불가
+    ])
+    second = write_csv(tmp_path / 'b.csv', [
+        ['2023-12-31', '12:00', '신부동', ''],
+        ['2024-01-02', '08:30', '성정동', ''],
+        ['2024-07-25', '09:10'],                    # 필드가 모자란 행
+    ], encoding='cp949')
+    return [first, second]
+
+
+def test_append_matches_full_scan(tmp_path):
+    files = sample_files(tmp_path)
+    full = update_counts(files)
+
+    npz = tmp_path / 'counts.npz'
+    update_counts(files[:1]).save(npz)
+    appended = update_counts(files[1:], counts=ViolationCounts.load(npz))
+
+    assert appended.total == full.total == 8
+    assert appended.known_years() == full.known_years() == [2023, 2024]
+    assert appended.date_ranges == full.date_ranges
+    assert [src['rows'] for src in appended.sources] == [5, 3]
+    assert patterns_from_counts(appended) == patterns_from_counts(full)
+
+    full_dongs, full_tensor = full.dong_tensor()
+    appended_dongs, appended_tensor = appended.dong_tensor()
+    assert dict(zip(appended_dongs, appended_tensor.tolist())) == dict(zip(full_dongs, full_tensor.tolist()))
+
+
+def test_parallel_scan_matches_serial(tmp_path):
+    files = sample_files(tmp_path)
+    serial = scan_files(files, workers=1, verbose=False)
+    parallel = scan_files(files, workers=2, verbose=False)
+    assert parallel.counts == serial.counts
+    assert parallel.date_ranges == serial.date_ranges
+    assert parallel.rows == serial.rows == 8
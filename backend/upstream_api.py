@@ -0,0 +1,203 @@
+"""
+기상청 단기예보 / 특일정보 API 호출 (백엔드와 Cloud Function이 같이 사용)
+응답을 예측 엔진이 쓰는 형태로 바꿔서 반환하고, 키가 없으면 None
+실패는 예외로 올려서 WeatherProvider/HolidayCalendar의 last_error(/weather/status 등)에 원인이 남게 한다
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from http_client import CircuitOpenError, UpstreamClient
+from prediction_engine import get_kst_now
+from weather_provider import WeatherSeries, kma_condition
+
+# 테스트 시 로컬 스텁 서버로 바꿀 수 있도록 기본 주소를 환경 변수로 분리
+KMA_API_BASE_URL = os.getenv("KMA_API_BASE_URL", "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0")
+HOLIDAY_API_BASE_URL = os.getenv("HOLIDAY_API_BASE_URL", "http://apis.data.go.kr/B090041/openapi/service/SpcdeInfoService")
+
+
+class UpstreamError(Exception):
+    """API 응답 오류 (200이 아닌 상태, 예상과 다른 응답 형식)"""
+
+
+# 조회 하나의 실패로 보는 예외 (그 외 예외는 코드 버그이므로 그대로 올린다)
+UPSTREAM_ERRORS = (httpx.HTTPError, CircuitOpenError, UpstreamError)
+
+
+def make_upstream_client() -> UpstreamClient:
+    """기상청/특일정보 API 공용 클라이언트 (커넥션 풀, 재시도, 서킷 브레이커)"""
+    return UpstreamClient(
+        per_host_limit=int(os.getenv("UPSTREAM_PER_HOST_LIMIT", "4")),
+        timeout=float(os.getenv("UPSTREAM_TIMEOUT", "5")),
+        retries=int(os.getenv("UPSTREAM_RETRIES", "2")),
+    )
+
+
+def get_vilage_fcst_base_time(now: datetime) -> Tuple[str, str]:
+    """단기예보 Base Time 계산 (02, 05, 08, 11, 14, 17, 20, 23시 + 10분)"""
+    # API 제공 시각을 고려해 15분 전 시간을 기준으로 계산
+    target = now - timedelta(minutes=15)
+    
+    hour = target.hour
+    if hour < 2:
+        base_hour = 23
+        base_date = (target - timedelta(days=1)).strftime("%Y%m%d")
+    else:
+        base_hour = ((hour - 2) // 3) * 3 + 2
+        base_date = target.strftime("%Y%m%d")
+        
+    return base_date, f"{base_hour:02d}00"
+
+
+async def fetch_grid_weather(client: UpstreamClient, nx: int, ny: int):
+    """기상청 단기예보 격자 하나의 날씨 조회 (키가 없으면 None, 실패하면 UPSTREAM_ERRORS 중 하나)"""
+    api_key = os.getenv("VITE_KMA_API_KEY") or os.getenv("KMA_API_KEY")
+    if not api_key or api_key == "your_kma_key":
+        return None
+    
+    # 한국 시간 기준 처리 필수
+    kst_now = get_kst_now()
+    base_date, base_time = get_vilage_fcst_base_time(kst_now)
+    
+    # 공공데이터포털 특유의 인증키 문제를 방지하기 위해 URL에 직접 포함하는 방식 권장
+    # 단, httpx의 자동 인코딩을 고려해 Decoding 키를 사용하는 것이 일반적
+    url = f"{KMA_API_BASE_URL}/getVilageFcst"
+    params = {
+        "serviceKey": api_key,
+        "pageNo": "1",
+        "numOfRows": "1000",
+        "dataType": "JSON",
+        "base_date": base_date,
+        "base_time": base_time,
+        "nx": nx,
+        "ny": ny
+    }
+    
+    response = await client.get(url, params=params)
+    if response.status_code != 200:
+        raise UpstreamError(f"status {response.status_code}")
+    try:
+        data = response.json()
+        items = data['response']['body']['items']['item']
+        
+        # 가장 빠른 예측 시간의 데이터 수집
+        weather = {}
+        target_fcst_time = None
+        
+        for item in items:
+            # 첫 번째 나오는 fcstTime을 타겟으로 잡음 (가장 가까운 미래)
+            if target_fcst_time is None:
+                target_fcst_time = item['fcstTime']
+            
+            if item['fcstTime'] == target_fcst_time:
+                cat = item['category']
+                val = item['fcstValue']
+                
+                if cat == 'TMP': # 1시간 기온
+                    weather['temperature'] = float(val)
+                elif cat == 'POP': # 강수확률
+                    weather['pop'] = int(val)
+                elif cat == 'PTY': # 강수형태
+                    weather['pty'] = int(val)
+                elif cat == 'SKY': # 하늘상태 (1:맑음, 3:구름많음, 4:흐림)
+                    weather['sky'] = int(val)
+
+        # 상태 매핑 (비/빗방울/소나기 -> rainy, 비눈/눈 -> snowy, 구름많음/흐림 -> cloudy)
+        condition = kma_condition(weather.get('pty', 0), weather.get('sky', 1))
+        
+        return {
+            "temperature": weather.get('temperature', 0),
+            "condition": condition,
+            "precipitationProbability": weather.get('pop', 0),
+            "rain_mm": 0,
+            "air_quality": "좋음",
+            "pm10": 15,
+            "pm25": 8,
+            # 이후 시간대 예보 (예측 시각별 날씨 가중치에 사용)
+            "series": WeatherSeries.from_items(items)
+        }
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        # 키 오류 등은 200에 XML 본문으로 오므로 JSON/필드 해석 실패로 드러난다
+        raise UpstreamError(f"unexpected response: {type(e).__name__}: {e}") from e
+
+
+async def fetch_holidays_for_year(client: UpstreamClient, year: int) -> Optional[List[str]]:
+    """특일(공휴일) 정보 연 단위 조회 -> 'YYYYMMDD' 목록 (키가 없으면 None, 실패하면 UPSTREAM_ERRORS 중 하나)"""
+    api_key = os.getenv("VITE_HOLIDAY_API_KEY") or os.getenv("HOLIDAY_API_KEY")
+    if not api_key or api_key == "your_holiday_key":
+        return None
+    
+    # solMonth를 생략하면 한 해 전체가 조회됨
+    url = f"{HOLIDAY_API_BASE_URL}/getRestDeInfo"
+    params = {
+        "serviceKey": api_key,
+        "solYear": str(year),
+        "numOfRows": "100",
+        "_type": "json"
+    }
+    
+    response = await client.get(url, params=params)
+    if response.status_code != 200:
+        raise UpstreamError(f"status {response.status_code}")
+    try:
+        body = response.json()["response"]["body"]
+        # items가 없거나 비어있는 경우 (공휴일 없음)
+        if "items" not in body or not body["items"]:
+            return []
+        items = body["items"]["item"]
+        if isinstance(items, dict):
+            items = [items]
+        return [str(item["locdate"]) for item in items if item.get("isHoliday") == "Y"]
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise UpstreamError(f"unexpected response: {type(e).__name__}: {e}") from e
+
+
+def add_weather_score(w_data: Dict) -> Dict:
+    """예측용 weather_score 계산 (비/눈 올 때 주차 수요 변화 가중치)"""
+    cond = w_data.get('condition', 'sunny')
+    w_score = 0
+    if cond == 'rainy': w_score = 0.2
+    elif cond == 'snowy': w_score = 0.3
+    w_data['weather_score'] = w_score
+    return w_data
+
+
+async def fetch_cells_weather(client: UpstreamClient, cells: List[Tuple[int, int]], city_cell: Tuple[int, int],
+                              previous: Optional[Dict] = None) -> Optional[Dict]:
+    """격자별 날씨를 동시에 조회 (호출 수 = 주차장 수가 아닌 격자 수)
+
+    반환: {"city": 대표 격자 날씨, "cells": {(nx, ny): 날씨}, "series": {(nx, ny): WeatherSeries}}
+    모든 격자가 실패하면 UpstreamError (첫 실패 원인 포함), 키가 없으면 None
+    """
+    results = await asyncio.gather(*(fetch_grid_weather(client, nx, ny) for nx, ny in cells),
+                                   return_exceptions=True)
+    
+    # 이번에 실패한 격자는 직전 값 유지
+    previous = previous or {}
+    by_cell = dict(previous.get('cells', {}))
+    series = dict(previous.get('series', {}))
+    fetched = 0
+    errors = []
+    for cell, w_data in zip(cells, results):
+        if isinstance(w_data, UPSTREAM_ERRORS):
+            errors.append(f"{cell}: {type(w_data).__name__}: {w_data}")
+            continue
+        if isinstance(w_data, BaseException):
+            raise w_data
+        if w_data:
+            cell_series = w_data.pop('series', None)
+            if cell_series is not None:
+                series[cell] = cell_series
+            by_cell[cell] = add_weather_score(w_data)
+            fetched += 1
+    if errors:
+        print(f"Weather API Error: {len(errors)}/{len(cells)} cells failed, first {errors[0]}")
+    if not fetched:
+        if errors:
+            raise UpstreamError(f"{len(errors)}/{len(cells)} cells failed, first {errors[0]}")
+        return None
+    city = by_cell.get(city_cell) or next(iter(by_cell.values()))
+    return {"city": city, "cells": by_cell, "series": series}
@@ -2,20 +2,56 @@
 """
 불법주정차 단속 데이터 분석 및 패턴 추출 스크립트
 """
+import argparse
+import codecs
 import csv
+import glob
+import hashlib
 import json
-from collections import defaultdict
-from datetime import datetime
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+import hotspot_density
+from parking_ingest import load_lots
+from violation_counts import COUNTS_NPZ, DONG_TENSOR_NPZ, ViolationCounts, save_dong_tensor
 
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 # 파일명에 공백이 포함되어 있음
 CSV_FILE = PROJECT_ROOT / "충청남도 천안시_불법주정차단속현황_20241231.csv"
+# 연도별/월별 단속 파일을 모두 찾는 기본 패턴
+CSV_GLOB = str(PROJECT_ROOT / "*불법주정차단속현황*.csv")
 OUTPUT_JSON = PROJECT_ROOT / "backend" / "violation_patterns.json"
+# 핫스팟 밀도 격자에서 동 위치를 잡을 때 쓰는 주차장 좌표
+PARKING_JSON = PROJECT_ROOT / "backend" / "parkingLots.json"
+
+# 공공데이터 CSV 인코딩 후보 (앞에서부터 시도, cp949는 euc-kr의 확장)
+ENCODINGS = ['utf-8', 'cp949', 'euc-kr']
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+
+def detect_encoding(path: Path) -> Optional[str]:
+    """파일 앞부분만 읽어서 인코딩 판별 (판별 실패 시 None)"""
+    with open(path, 'rb') as f:
+        sample = f.read(ENCODING_SAMPLE_BYTES)
+    for encoding in ENCODINGS:
+        try:
+            # 샘플 끝에서 잘린 멀티바이트 문자는 무시 (final=False)
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
 
 
+@lru_cache(maxsize=4096)
 def safe_parse_time(time_str: str) -> int:
     """시간 문자열에서 시간(hour) 추출"""
     try:
@@ -28,8 +64,16 @@ def safe_parse_time(time_str: str) -> int:
         return -1
 
 
+@lru_cache(maxsize=8192)
 def safe_parse_date(date_str: str) -> tuple:
-    """날짜 문자열에서 (year, month, weekday) 추출"""
+    """날짜 문자열에서 (year, month, weekday) 추출 (같은 날짜가 반복되므로 결과를 캐시)"""
+    # 대부분의 행은 2024-07-25 형식이므로 strptime 없이 바로 계산
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            year, month, day = int(date_str[:4]), int(date_str[5:7]), int(date_str[8:])
+            return year, month, date(year, month, day).weekday()
+        except ValueError:
+            pass
     try:
         # 형식: 2024-07-25
         dt = datetime.strptime(date_str, '%Y-%m-%d')
@@ -57,82 +101,154 @@ def extract_dong(location: str) -> str:
     return "기타"
 
 
-def analyze_violations() -> Dict[str, Any]:
-    """불법주정차 단속 데이터 분석"""
-    
-    patterns = {
-        'hourly': defaultdict(int),      # 시간대별 (0-23시)
-        'daily': defaultdict(int),       # 요일별 (0-6, 월-일)
-        'monthly': defaultdict(int),     # 월별 (1-12)
-        'by_dong': defaultdict(int),     # 동별 단속 건수
-        'dong_hourly': defaultdict(lambda: defaultdict(int)),  # 동+시간대
-        'dong_daily': defaultdict(lambda: defaultdict(int)),   # 동+요일
-        'total_count': 0,
-        'date_range': {'start': None, 'end': None}
-    }
-    
-    if not CSV_FILE.exists():
-        print(f"❌ CSV 파일을 찾을 수 없습니다: {CSV_FILE}")
-        return patterns
+# 행 하나를 (연도, 월, 요일, 시, 동) 키 하나로 세어 두면 모든 집계를 여기서 다시 만들 수 있고,
+# 파일/프로세스별 부분 결과는 Counter 덧셈으로 합쳐진다.
+RowKey = Tuple[Optional[int], Optional[int], Optional[int], int, str]
+
+
+class ScanResult:
+    """CSV 파일(들)의 부분 집계: 키별 건수 + 연도별 날짜 범위"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.date_ranges: Dict[Optional[int], List[str]] = {}   # 연도 -> [최소, 최대] 날짜 문자열
+        self.rows = 0
+        self.elapsed = 0.0
+        self.sources: List[Dict[str, Any]] = []   # 집계한 파일 {'name', 'sha256', 'rows'}
+
+    def merge(self, other: "ScanResult") -> "ScanResult":
+        self.counts.update(other.counts)
+        for year, (start, end) in other.date_ranges.items():
+            current = self.date_ranges.get(year)
+            if current is None:
+                self.date_ranges[year] = [start, end]
+            else:
+                current[0] = min(current[0], start)
+                current[1] = max(current[1], end)
+        self.rows += other.rows
+        self.elapsed += other.elapsed
+        self.sources.extend(other.sources)
+        return self
+
+
+def file_checksum(path: Path) -> str:
+    """파일 내용 SHA-256 (--append 때 이미 반영한 파일인지 확인용)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_csv(csv_file: Path) -> ScanResult:
+    """CSV를 한 줄씩 읽으며 집계 (파일 전체를 메모리에 올리지 않음)"""
+    result = ScanResult()
+    encoding = detect_encoding(csv_file)
+    if encoding is None:
+        raise ValueError(f"인코딩을 판별할 수 없습니다 (시도: {', '.join(ENCODINGS)})")
     
-    # 인코딩 시도 (CP949 또는 UTF-8)
-    encodings = ['cp949', 'utf-8', 'euc-kr']
+    counts, date_ranges = result.counts, result.date_ranges
+    started = time.perf_counter()
+    with open(csv_file, 'r', encoding=encoding, newline='') as f:
+        for row in csv.DictReader(f):
+            # 필드가 모자란 행은 DictReader가 None을 넣으므로 빈 문자열로 바꿔서 센다
+            date_str = row.get('단속일자') or ''
+            year, month, weekday = safe_parse_date(date_str)
+            if date_str:
+                span = date_ranges.get(year)
+                if span is None:
+                    date_ranges[year] = [date_str, date_str]
+                elif date_str < span[0]:
+                    span[0] = date_str
+                elif date_str > span[1]:
+                    span[1] = date_str
+            
+            hour = safe_parse_time(row.get('단속시간') or '')
+            if not 0 <= hour <= 23:
+                hour = -1
+            
+            dong = (row.get('단속동') or '').strip()
+            if not dong:
+                dong = extract_dong(row.get('단속장소') or '')
+            
+            counts[(year, month, weekday, hour, dong)] += 1
+            result.rows += 1
+    result.elapsed = time.perf_counter() - started
+    result.sources.append({'name': csv_file.name, 'sha256': file_checksum(csv_file), 'rows': result.rows})
+    return result
+
+
+def _scan_file(path: str) -> Tuple[str, Optional[ScanResult], Optional[str]]:
+    """프로세스 풀 작업 단위 (예외 대신 오류 메시지를 돌려줌)
+
+    파일 하나의 예상 못한 오류가 풀 전체(다른 파일 집계, --append)를 멈추지 않도록 모든 예외를 잡는다.
+    """
+    try:
+        return path, scan_csv(Path(path)), None
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+
+
+def scan_files(csv_files: List[Path], workers: int = 1, verbose: bool = True) -> ScanResult:
+    """여러 CSV를 (필요하면 프로세스 풀로) 집계해 하나로 합침, 합치는 순서는 파일 순서"""
+    paths = [str(p) for p in csv_files]
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            scanned = list(pool.map(_scan_file, paths))
+    else:
+        scanned = [_scan_file(p) for p in paths]
     
-    for encoding in encodings:
-        try:
-            with open(CSV_FILE, 'r', encoding=encoding) as f:
-                reader = csv.DictReader(f)
-                dates = []
-                
-                for row in reader:
-                    patterns['total_count'] += 1
-                    
-                    # 날짜 분석
-                    date_str = row.get('단속일자', '')
-                    year, month, weekday = safe_parse_date(date_str)
-                    if weekday is not None:
-                        patterns['daily'][weekday] += 1
-                    if month is not None:
-                        patterns['monthly'][month] += 1
-                    if date_str:
-                        dates.append(date_str)
-                    
-                    # 시간 분석
-                    time_str = row.get('단속시간', '')
-                    hour = safe_parse_time(time_str)
-                    if 0 <= hour <= 23:
-                        patterns['hourly'][hour] += 1
-                    
-                    # 동 분석
-                    dong = row.get('단속동', '').strip()
-                    if not dong:
-                        location = row.get('단속장소', '')
-                        dong = extract_dong(location)
-                    
-                    if dong:
-                        patterns['by_dong'][dong] += 1
-                        if 0 <= hour <= 23:
-                            patterns['dong_hourly'][dong][hour] += 1
-                        if weekday is not None:
-                            patterns['dong_daily'][dong][weekday] += 1
-                
-                # 날짜 범위
-                if dates:
-                    patterns['date_range']['start'] = min(dates)
-                    patterns['date_range']['end'] = max(dates)
-                
-                print(f"✅ 인코딩 '{encoding}'으로 성공적으로 읽었습니다.")
-                break
-                
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            print(f"⚠️ 인코딩 '{encoding}' 실패: {e}")
+    total = ScanResult()
+    for path, result, error in scanned:
+        if result is None:
+            print(f"⚠️ {Path(path).name} 건너뜀: {error}")
             continue
+        rate = result.rows / result.elapsed if result.elapsed > 0 else 0
+        if verbose:
+            print(f"✅ {Path(path).name}: {result.rows:,}행 ({result.elapsed:.2f}초, {rate:,.0f}행/초)")
+        total.merge(result)
+    return total
+
+
+def update_counts(csv_files: List[Path], workers: int = 1, counts: Optional[ViolationCounts] = None) -> ViolationCounts:
+    """CSV들을 집계해 원시 건수 배열에 더함"""
+    counts = counts if counts is not None else ViolationCounts.empty()
+    missing = [p for p in csv_files if not p.exists()]
+    for path in missing:
+        print(f"❌ CSV 파일을 찾을 수 없습니다: {path}")
     
+    scan = scan_files([p for p in csv_files if p.exists()], workers)
+    counts.add(scan.counts, scan.date_ranges, scan.sources)
+    return counts
+
+
+def patterns_from_counts(counts: ViolationCounts) -> Dict[str, Any]:
+    """원시 건수 -> 전체 기간 집계 + 연도별 집계('by_year')"""
+    patterns = counts.to_patterns()
+    patterns['by_year'] = {year: counts.to_patterns(year) for year in counts.known_years()}
     return patterns
 
 
+def analyze_violations(csv_files: Optional[List[Path]] = None, workers: int = 1) -> Dict[str, Any]:
+    """불법주정차 단속 데이터 분석 (파일마다 한 번만 읽고 집계, 연도별 집계는 'by_year')"""
+    csv_files = csv_files if csv_files is not None else [CSV_FILE]
+    return patterns_from_counts(update_counts(csv_files, workers))
+
+
+def benchmark(csv_files: List[Path], max_workers: int):
+    """프로세스 수를 늘려 가며 같은 파일 묶음을 집계하는 시간 비교"""
+    print(f"\n⏱️ 벤치마크: 파일 {len(csv_files)}개, CPU {os.cpu_count()}개")
+    worker_counts = sorted({1, *[w for w in (2, 4, 8, 16) if w < max_workers], max_workers})
+    baseline = None
+    for workers in worker_counts:
+        started = time.perf_counter()
+        scan = scan_files(csv_files, workers, verbose=False)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"   workers={workers:>2}: {elapsed:.2f}초, {scan.rows / elapsed:,.0f}행/초, "
+              f"x{baseline / elapsed:.2f}")
+
+
 def normalize_patterns(patterns: Dict) -> Dict[str, Any]:
     """패턴을 정규화하여 가중치로 변환"""
     total = patterns['total_count']
@@ -200,28 +316,109 @@ def normalize_patterns(patterns: Dict) -> Dict[str, Any]:
         'top_dongs': [d for d, _ in sorted_dongs[:10]]
     }
     
+    # 연도별 건수 (가중치는 전체 기간 기준으로만 계산)
+    if patterns.get('by_year'):
+        result['by_year'] = {str(year): summarize_year(p) for year, p in sorted(patterns['by_year'].items())}
+    
     return result
 
 
+def summarize_year(patterns: Dict) -> Dict[str, Any]:
+    """연도 하나의 건수 요약"""
+    top_dongs = sorted(patterns['by_dong'].items(), key=lambda x: x[1], reverse=True)[:30]
+    return {
+        'total_count': patterns['total_count'],
+        'date_range': patterns['date_range'],
+        'hourly': {str(hour): patterns['hourly'].get(hour, 0) for hour in range(24)},
+        'daily': {str(day): patterns['daily'].get(day, 0) for day in range(7)},
+        'monthly': {str(month): patterns['monthly'].get(month, 0) for month in range(1, 13)},
+        'by_dong': dict(top_dongs),
+    }
+
+
+def build_hotspot_density(patterns: Dict):
+    """동별 단속 건수로 핫스팟 밀도 격자(.npy)를 만들어 저장"""
+    coords = hotspot_density.area_coords(load_lots(PARKING_JSON))
+    density, meta = hotspot_density.build_from_counts(dict(patterns['by_dong']), coords)
+    hotspot_density.save(density, meta)
+    
+    print(f"\n🗺️ 핫스팟 밀도 격자 저장: {hotspot_density.DENSITY_NPY.name} {density.shape}")
+    print(f"   반영 {len(meta['areas'])}개 지역 {meta['total_count']:,}건, "
+          f"좌표 없음 {len(meta['skipped_areas'])}개 지역 {sum(meta['skipped_areas'].values()):,}건")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="불법주정차 단속 데이터 분석 및 패턴 추출")
+    parser.add_argument('inputs', nargs='*', default=[CSV_GLOB],
+                        help="단속 CSV 파일 또는 glob 패턴 (기본: 프로젝트 루트의 *불법주정차단속현황*.csv)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="집계 프로세스 수")
+    parser.add_argument('--benchmark', action='store_true', help="프로세스 수별 집계 시간만 측정")
+    parser.add_argument('--append', action='store_true',
+                        help=f"저장된 원시 건수({COUNTS_NPZ.name})에 아직 반영하지 않은 파일만 더함")
+    return parser.parse_args()
+
+
+def resolve_inputs(inputs: List[str]) -> List[Path]:
+    """파일/glob 목록 -> 중복 없는 CSV 경로 목록 (정렬)"""
+    paths = set()
+    for pattern in inputs:
+        matched = glob.glob(pattern)
+        paths.update(Path(p).resolve() for p in (matched or [pattern]))
+    return sorted(paths)
+
+
 def main():
     """메인 실행 함수"""
+    args = parse_args()
+    csv_files = resolve_inputs(args.inputs)
+    
+    if args.benchmark:
+        benchmark(csv_files, max(1, args.workers))
+        return
+    
     print("🚨 불법주정차 단속 데이터 분석 시작...")
-    print(f"   입력: {CSV_FILE}")
+    for path in csv_files:
+        print(f"   입력: {path}")
     print(f"   출력: {OUTPUT_JSON}")
     
-    patterns = analyze_violations()
+    counts = ViolationCounts.empty()
+    if args.append:
+        counts = ViolationCounts.load()
+        if counts is None:
+            # 빈 건수에서 시작하면 새 파일만으로 패턴/텐서를 덮어써서 기존 집계가 사라진다
+            print(f"❌ --append에는 {COUNTS_NPZ.name}가 필요합니다. 먼저 --append 없이 전체 파일을 분석하세요.")
+            sys.exit(1)
+        known = [p for p in csv_files if p.exists() and counts.has_source(file_checksum(p))]
+        for path in known:
+            print(f"   이미 반영됨: {path.name}")
+        csv_files = [p for p in csv_files if p not in known]
+        if not csv_files:
+            print("ℹ️ 새로 반영할 파일이 없습니다.")
+            return
+    
+    counts = update_counts(csv_files, max(1, args.workers), counts)
     
-    if patterns['total_count'] == 0:
+    if counts.total == 0:
         print("❌ 분석된 데이터가 없습니다!")
         return
     
+    counts.save()
+    dongs, tensor = counts.dong_tensor()
+    save_dong_tensor(dongs, tensor)
+    print(f"🧮 동 × 요일 × 시 텐서 저장: {DONG_TENSOR_NPZ.name} {tensor.shape}")
+    started = time.perf_counter()
+    patterns = patterns_from_counts(counts)
     normalized = normalize_patterns(patterns)
+    print(f"📦 원시 건수 저장: {COUNTS_NPZ.name} (파일 {len(counts.sources)}개), "
+          f"가중치 재계산 {(time.perf_counter() - started) * 1000:.1f}ms")
     
     # JSON 파일 저장
     OUTPUT_JSON.parent.mkdir(parents=True, exist_ok=True)
     with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
         json.dump(normalized, f, ensure_ascii=False, indent=2)
     
+    build_hotspot_density(patterns)
+    
     print(f"\n✅ 완료! 총 {normalized['total_count']:,}건 분석됨")
     print(f"   기간: {normalized['date_range']['start']} ~ {normalized['date_range']['end']}")
     
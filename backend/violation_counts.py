@@ -0,0 +1,181 @@
+"""
+불법주정차 단속 원시 건수 (violation_patterns.json 옆에 .npz로 저장)
+연도 × 월 × 요일 × 시 × 동 건수를 그대로 보관해 두면, 새 파일만 더해서 가중치를 다시 만들 수 있다.
+예측 엔진은 여기서 뽑은 동 × 요일 × 시 건수 텐서(violation_dong_tensor.npz)만 읽는다.
+"""
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent
+COUNTS_NPZ = BACKEND_DIR / "violation_counts.npz"
+DONG_TENSOR_NPZ = BACKEND_DIR / "violation_dong_tensor.npz"
+
+UNKNOWN_YEAR = -1
+# 축 길이 (마지막 칸은 값을 알 수 없는 행)
+N_MONTH = 13    # 1..12, 0 = 알 수 없음
+N_WEEKDAY = 8   # 0..6 (월~일), 7 = 알 수 없음
+N_HOUR = 25     # 0..23, 24 = 알 수 없음
+
+
+class ViolationCounts:
+    def __init__(self, years: List[int], dongs: List[str], counts: np.ndarray,
+                 date_ranges: Optional[Dict[int, List[str]]] = None, sources: Optional[List[Dict]] = None):
+        self.years = years          # UNKNOWN_YEAR 포함 가능
+        self.dongs = dongs          # 처음 나온 순서
+        self.counts = counts        # int64 [연도, 월, 요일, 시, 동]
+        self.date_ranges = date_ranges or {}   # 연도 -> [최소, 최대] 날짜 문자열
+        self.sources = sources or []           # 반영한 파일 {'name', 'sha256', 'rows'}
+        self._year_index = {y: i for i, y in enumerate(years)}
+        self._dong_index = {d: i for i, d in enumerate(dongs)}
+
+    @classmethod
+    def empty(cls) -> "ViolationCounts":
+        return cls([], [], np.zeros((0, N_MONTH, N_WEEKDAY, N_HOUR, 0), dtype=np.int64))
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def has_source(self, sha256: str) -> bool:
+        return any(src['sha256'] == sha256 for src in self.sources)
+
+    def _grow(self, years: Iterable[int], dongs: Iterable[str]):
+        new_years = [y for y in dict.fromkeys(years) if y not in self._year_index]
+        new_dongs = [d for d in dict.fromkeys(dongs) if d not in self._dong_index]
+        if not new_years and not new_dongs:
+            return
+        self.counts = np.pad(self.counts, ((0, len(new_years)), (0, 0), (0, 0), (0, 0), (0, len(new_dongs))))
+        for y in new_years:
+            self._year_index[y] = len(self.years)
+            self.years.append(y)
+        for d in new_dongs:
+            self._dong_index[d] = len(self.dongs)
+            self.dongs.append(d)
+
+    def add(self, counts: Counter, date_ranges: Dict[Optional[int], List[str]], sources: List[Dict] = ()):
+        """(연도, 월, 요일, 시, 동) 키별 건수를 더함 (값을 알 수 없는 칸은 None / -1)"""
+        keys = list(counts)
+        self._grow((UNKNOWN_YEAR if k[0] is None else k[0] for k in keys), (k[4] for k in keys))
+        if keys:
+            idx = np.array([
+                (self._year_index[UNKNOWN_YEAR if year is None else year],
+                 0 if month is None else month,
+                 N_WEEKDAY - 1 if weekday is None else weekday,
+                 N_HOUR - 1 if hour < 0 else hour,
+                 self._dong_index[dong])
+                for year, month, weekday, hour, dong in keys
+            ], dtype=np.intp)
+            np.add.at(self.counts, tuple(idx.T), np.fromiter(counts.values(), dtype=np.int64, count=len(keys)))
+
+        for year, (start, end) in date_ranges.items():
+            year = UNKNOWN_YEAR if year is None else year
+            current = self.date_ranges.get(year)
+            if current is None:
+                self.date_ranges[year] = [start, end]
+            else:
+                self.date_ranges[year] = [min(current[0], start), max(current[1], end)]
+        self.sources.extend(sources)
+
+    def known_years(self) -> List[int]:
+        return sorted(y for i, y in enumerate(self.years) if y != UNKNOWN_YEAR and self.counts[i].any())
+
+    def to_patterns(self, year: Optional[int] = None) -> Dict[str, Any]:
+        """건수 배열 -> 시간대/요일/월/동별 건수 (violation_analyzer.normalize_patterns 입력 형식)"""
+        if year is None:
+            sub = self.counts.sum(axis=0)
+            spans = list(self.date_ranges.values())
+        else:
+            sub = self.counts[self._year_index[year]]
+            spans = [self.date_ranges[year]] if year in self.date_ranges else []
+
+        # 동별 [월, 요일, 시] -> 축별 합계
+        by_dong_hour = sub.sum(axis=(0, 1))       # [시, 동]
+        by_dong_weekday = sub.sum(axis=(0, 2))    # [요일, 동]
+        hourly = by_dong_hour.sum(axis=1)
+        daily = by_dong_weekday.sum(axis=1)
+        monthly = sub.sum(axis=(1, 2, 3))
+        dong_totals = sub.sum(axis=(0, 1, 2))
+
+        patterns = {
+            'hourly': {h: int(hourly[h]) for h in range(24) if hourly[h]},
+            'daily': {w: int(daily[w]) for w in range(7) if daily[w]},
+            'monthly': {m: int(monthly[m]) for m in range(1, 13) if monthly[m]},
+            'by_dong': {},
+            'dong_hourly': defaultdict(dict),
+            'dong_daily': defaultdict(dict),
+            'total_count': int(sub.sum()),
+            'date_range': {'start': None, 'end': None},
+        }
+        for d, dong in enumerate(self.dongs):
+            if not dong or not dong_totals[d]:
+                continue
+            patterns['by_dong'][dong] = int(dong_totals[d])
+            patterns['dong_hourly'][dong] = {h: int(by_dong_hour[h, d]) for h in range(24) if by_dong_hour[h, d]}
+            patterns['dong_daily'][dong] = {w: int(by_dong_weekday[w, d]) for w in range(7) if by_dong_weekday[w, d]}
+        if spans:
+            patterns['date_range'] = {'start': min(s[0] for s in spans), 'end': max(s[1] for s in spans)}
+        return patterns
+
+    def dong_tensor(self) -> Tuple[List[str], np.ndarray]:
+        """모든 동의 [동, 요일(0~6), 시(0~23)] 건수 (요일/시를 알 수 없는 행은 제외)"""
+        sub = self.counts.sum(axis=(0, 1))[:7, :24, :]     # [요일, 시, 동]
+        keep = [d for d, dong in enumerate(self.dongs) if dong and sub[:, :, d].any()]
+        tensor = np.ascontiguousarray(sub[:, :, keep].transpose(2, 0, 1)).astype(np.int32)
+        return [self.dongs[d] for d in keep], tensor
+
+    def save(self, path: Path = COUNTS_NPZ):
+        meta = {
+            'date_ranges': {str(y): span for y, span in self.date_ranges.items()},
+            'sources': self.sources,
+        }
+        # np.savez는 확장자를 붙이므로 임시 파일도 .npz로 만든 뒤 교체
+        tmp_path = path.with_name(path.stem + '.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            counts=self.counts,
+            years=np.array(self.years, dtype=np.int64),
+            dongs=np.array(self.dongs, dtype=str),
+            meta=np.array(json.dumps(meta, ensure_ascii=False)),
+        )
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = COUNTS_NPZ) -> Optional["ViolationCounts"]:
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(
+                years=[int(y) for y in data['years']],
+                dongs=[str(d) for d in data['dongs']],
+                counts=data['counts'].astype(np.int64),
+                date_ranges={int(y): span for y, span in meta['date_ranges'].items()},
+                sources=meta['sources'],
+            )
+
+
+def save_dong_tensor(dongs: List[str], tensor: np.ndarray, path: Path = DONG_TENSOR_NPZ):
+    tmp_path = path.with_name(path.stem + '.tmp.npz')
+    np.savez(tmp_path, dongs=np.array(dongs, dtype=str), counts=tensor)
+    tmp_path.replace(path)
+
+
+def load_dong_tensor(path: Path = DONG_TENSOR_NPZ) -> Optional[Tuple[List[str], np.ndarray]]:
+    """(동 목록, [동, 요일, 시] 건수), 파일이 없거나 깨져 있으면 None"""
+    if not path.exists():
+        return None
+    try:
+        with np.load(path) as data:
+            dongs = [str(d) for d in data['dongs']]
+            tensor = data['counts']
+    except (ValueError, OSError, KeyError) as e:
+        print(f"Dong tensor load failed: {e}")
+        return None
+    if tensor.shape != (len(dongs), 7, 24):
+        print(f"Dong tensor shape mismatch: {tensor.shape}")
+        return None
+    return dongs, tensor
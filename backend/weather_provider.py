@@ -0,0 +1,200 @@
+"""
+백그라운드 갱신 날씨 캐시
+- 주기적으로 백그라운드 태스크에서 갱신하고, 요청 경로에서는 캐시된 값만 읽는다 (stale-while-revalidate)
+- 동시에 여러 갱신 요청이 와도 실제 API 호출은 하나만 진행된다 (single-flight)
+- 기상청 단기예보의 시간별 값을 배열로 보관해 예측 시각별로 조회한다 (WeatherSeries)
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+WeatherFetcher = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+RAIN_PTY = (1, 4, 5)    # 비, 소나기, 빗방울
+SNOW_PTY = (2, 3)       # 비/눈, 눈
+WET_PTY = RAIN_PTY + SNOW_PTY
+
+
+def kma_condition(pty: int, sky: int) -> str:
+    """강수형태(PTY)/하늘상태(SKY) 코드 -> sunny/cloudy/rainy/snowy"""
+    if pty > 0:
+        if pty in RAIN_PTY: return "rainy"
+        if pty in SNOW_PTY: return "snowy"
+        return "sunny"
+    if sky > 2:
+        return "cloudy"
+    return "sunny"
+
+
+class WeatherSeries:
+    """단기예보 시간별 값 (start부터 1시간 간격, 한국 시간 기준)"""
+    __slots__ = ('start', 'tmp', 'pop', 'pty', 'sky')
+
+    CATEGORIES = ('TMP', 'POP', 'PTY', 'SKY')
+
+    def __init__(self, start: datetime, tmp: np.ndarray, pop: np.ndarray, pty: np.ndarray, sky: np.ndarray):
+        self.start = start
+        self.tmp = tmp      # 기온 (float32, 값이 없으면 nan)
+        self.pop = pop      # 강수확률 (int8)
+        self.pty = pty      # 강수형태 (int8)
+        self.sky = sky      # 하늘상태 (int8)
+
+    def __len__(self) -> int:
+        return len(self.pty)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Dict[str, Any]]) -> Optional["WeatherSeries"]:
+        """getVilageFcst 응답 item 목록에서 TMP/POP/PTY/SKY 시계열 추출"""
+        by_time: Dict[str, Dict[str, str]] = {}
+        for item in items:
+            cat = item.get('category')
+            if cat not in cls.CATEGORIES or not item.get('fcstDate'):
+                continue
+            by_time.setdefault(item['fcstDate'] + item['fcstTime'], {})[cat] = item['fcstValue']
+        if not by_time:
+            return None
+
+        times = {key: datetime.strptime(key, '%Y%m%d%H%M') for key in by_time}
+        start = min(times.values())
+        size = int((max(times.values()) - start).total_seconds() // 3600) + 1
+        tmp = np.full(size, np.nan, dtype=np.float32)
+        pop = np.zeros(size, dtype=np.int8)
+        pty = np.zeros(size, dtype=np.int8)
+        sky = np.ones(size, dtype=np.int8)
+        for key, values in by_time.items():
+            i = int((times[key] - start).total_seconds() // 3600)
+            try:
+                if 'TMP' in values: tmp[i] = float(values['TMP'])
+                if 'POP' in values: pop[i] = int(values['POP'])
+                if 'PTY' in values: pty[i] = int(values['PTY'])
+                if 'SKY' in values: sky[i] = int(values['SKY'])
+            except ValueError:
+                continue
+        return cls(start, tmp, pop, pty, sky)
+
+    def offsets(self, times: List[datetime]) -> np.ndarray:
+        """각 시각의 배열 위치 (범위 밖이면 -1)"""
+        hours = np.array([(t.replace(minute=0, second=0, microsecond=0) - self.start) // timedelta(hours=1)
+                          for t in times], dtype=np.intp)
+        hours[(hours < 0) | (hours >= len(self))] = -1
+        return hours
+
+    def condition_at(self, when: datetime) -> Optional[str]:
+        i = self.offsets([when])[0]
+        if i < 0:
+            return None
+        return kma_condition(int(self.pty[i]), int(self.sky[i]))
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "time": (self.start + timedelta(hours=i)).strftime('%Y-%m-%d %H:00'),
+                "temperature": None if np.isnan(self.tmp[i]) else float(self.tmp[i]),
+                "precipitationProbability": int(self.pop[i]),
+                "condition": kma_condition(int(self.pty[i]), int(self.sky[i])),
+            }
+            for i in range(len(self))
+        ]
+
+
+class WeatherProvider:
+    def __init__(self, fetch: WeatherFetcher, refresh_interval: float = 1800, retry_interval: float = 120):
+        self._fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+
+        self.data: Optional[Dict[str, Any]] = None
+        self.version = 0                    # 새 데이터를 받을 때마다 증가
+        self.last_success: Optional[datetime] = None
+        self.last_attempt: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.success_count = 0
+        self.failure_count = 0
+        self.consecutive_failures = 0
+
+        self._fetched_at = 0.0              # time.monotonic() 기준
+        self._next_attempt_at = 0.0         # 실패 후 재시도 가능 시각
+        self._inflight: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def is_stale(self) -> bool:
+        return self.data is None or time.monotonic() - self._fetched_at > self.refresh_interval
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """캐시된 날씨를 바로 반환 (오래된 경우 갱신만 예약하고 기다리지 않음)"""
+        if self.is_stale():
+            self.trigger_refresh()
+        return self.data
+
+    def trigger_refresh(self):
+        if self._inflight is not None and not self._inflight.done():
+            return
+        if time.monotonic() < self._next_attempt_at:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._inflight = asyncio.create_task(self._do_refresh())
+
+    async def refresh(self) -> bool:
+        """갱신 실행 (이미 진행 중이면 그 결과를 함께 기다림)"""
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.create_task(self._do_refresh())
+        return await asyncio.shield(self._inflight)
+
+    async def _do_refresh(self) -> bool:
+        self.last_attempt = datetime.now(timezone.utc)
+        try:
+            data = await self._fetch()
+            error = None if data else "empty response"
+        except Exception as e:
+            data, error = None, f"{type(e).__name__}: {e}"
+
+        if data:
+            self.data = data
+            self.version += 1
+            self.last_success = self.last_attempt
+            self.success_count += 1
+            self.consecutive_failures = 0
+            self._fetched_at = time.monotonic()
+            return True
+
+        self.last_error = error
+        self.failure_count += 1
+        self.consecutive_failures += 1
+        self._next_attempt_at = time.monotonic() + self.retry_interval
+        print(f"Weather refresh failed ({self.consecutive_failures} in a row): {error}")
+        return False
+
+    async def _run(self):
+        while True:
+            ok = await self.refresh()
+            await asyncio.sleep(self.refresh_interval if ok else self.retry_interval)
+
+    def start(self):
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in (self._loop_task, self._inflight):
+            if task and not task.done():
+                task.cancel()
+        self._loop_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "has_data": self.data is not None,
+            "stale": self.is_stale(),
+            "version": self.version,
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+            "last_attempt": self.last_attempt.isoformat() if self.last_attempt else None,
+            "last_error": self.last_error,
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "consecutive_failures": self.consecutive_failures,
+            "refreshing": self._inflight is not None and not self._inflight.done(),
+        }
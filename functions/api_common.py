@@ -0,0 +1,67 @@
+"""
+Cloud Function 경로별 앱이 같이 쓰는 설정과 데이터 (인스턴스마다 한 번만 로드)
+"""
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+# ===== 경로 설정 (Functions 환경 최적화) =====
+BACKEND_DIR = Path(__file__).resolve().parent
+# Functions 환경에서는 파일들이 같은 폴더에 있음
+PARKING_JSON = BACKEND_DIR / "parkingLots.json"
+VIOLATION_PATTERNS_JSON = BACKEND_DIR / "violation_patterns.json"
+
+# 백엔드와 같이 쓰는 예측 코드 (배포 전에 sync_backend.py가 backend/에서 복사, 로컬에서는 backend/를 직접 사용)
+SHARED_DIR = BACKEND_DIR / "backend_shared"
+REPO_BACKEND_DIR = BACKEND_DIR.parent / "backend"
+
+API_TITLE = "Cheonan AI Parking Pass API (Cloud)"
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title=API_TITLE)
+    # CORS 설정 (함수 레벨에서도 가능하지만 FastAPI 미들웨어로 유지)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # 클라우드 함수 환경에서는 유연하게 설정
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+
+def use_backend_modules() -> Path:
+    """백엔드 공용 모듈 폴더를 import 경로에 추가하고 그 경로를 반환"""
+    path = SHARED_DIR if (SHARED_DIR / "prediction_engine.py").exists() else REPO_BACKEND_DIR
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+    return path
+
+
+# ===== 데이터 로드 (인스턴스 수명 동안 캐시) =====
+_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_data() -> Tuple[List[Dict], Dict]:
+    if "parking" not in _cache:
+        with _cache_lock:
+            if "parking" not in _cache:
+                data = _read_json(PARKING_JSON, [])
+                # parking_ingest 형식 {"schemaVersion", "source", "lots"} 또는 예전 배열
+                _cache["patterns"] = _read_json(VIOLATION_PATTERNS_JSON, {})
+                _cache["parking"] = data.get("lots", []) if isinstance(data, dict) else data
+    return _cache["parking"], _cache["patterns"]
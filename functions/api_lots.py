@@ -0,0 +1,26 @@
+"""
+주차장 목록 (/parking-lots): JSON 파일만 읽으므로 numpy/DB 라이브러리를 import하지 않는다
+"""
+import json
+
+from fastapi import Response
+
+from api_common import create_app, load_data
+
+app = create_app()
+
+_lots_body = None
+
+
+def lots_body() -> bytes:
+    """주차장 목록 응답 본문 (인스턴스당 한 번만 직렬화)"""
+    global _lots_body
+    if _lots_body is None:
+        lots, _ = load_data()
+        _lots_body = json.dumps(lots, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _lots_body
+
+
+@app.get("/parking-lots")
+async def get_lots():
+    return Response(content=lots_body(), media_type="application/json")
@@ -0,0 +1,109 @@
+"""
+혼잡도 예측 (/predictions)
+백엔드와 같은 PredictionEngine을 인스턴스마다 하나 만들어 두고 요청마다 재사용한다.
+날씨/공휴일도 백엔드와 같은 API 호출 코드(upstream_api)로 백그라운드에서 받아서, 받은 뒤에는 백엔드와 같은 예측을 낸다.
+"""
+import asyncio
+import os
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from api_common import create_app, load_data, use_backend_modules
+
+SHARED_DIR = use_backend_modules()
+
+from holiday_calendar import HolidayCalendar  # noqa: E402
+from kma_grid import map_to_grid  # noqa: E402
+from prediction_engine import CITY_CENTER, FORECAST_HORIZON_HOURS, PredictionEngine  # noqa: E402
+from weather_provider import WeatherProvider  # noqa: E402
+
+app = create_app()
+
+# 배포 폴더는 읽기 전용이므로 공휴일 달력은 /tmp에 저장하고,
+# sync_backend.py가 복사해 둔 백엔드 달력이 있으면 처음 값으로 사용
+HOLIDAY_CACHE_FILE = Path(os.getenv("HOLIDAY_CACHE_FILE", "/tmp/holiday_cache.json"))
+HOLIDAY_CACHE_SEED = SHARED_DIR / "holiday_cache.json"
+WEATHER_REFRESH_INTERVAL = int(os.getenv("WEATHER_REFRESH_INTERVAL", "1800"))  # 초
+
+
+class PredictionRequest(BaseModel):
+    parking_id: str
+    hours_ahead: int = Field(24, ge=1, le=FORECAST_HORIZON_HOURS)
+
+class PredictionData(BaseModel):
+    time: str
+    occupancy_rate: float
+    confidence: float
+    factors: Optional[Dict[str, float]] = None
+
+
+# ===== 날씨/공휴일 (인스턴스당 하나) =====
+_grid_cells: List = []      # 주차장들이 속한 기상청 격자 (엔진 생성 시 채움)
+_upstream = None
+
+def _load_upstream():
+    import upstream_api
+    return upstream_api, upstream_api.make_upstream_client()
+
+async def _upstream_api():
+    """(upstream_api 모듈, 클라이언트)
+    httpx import가 무거워서(~160ms) 첫 백그라운드 조회 때 스레드에서 불러온다.
+    이벤트 루프에서 불러오면 첫 요청 응답이 그만큼 늦어진다.
+    """
+    global _upstream
+    if _upstream is None:
+        loaded = await asyncio.get_running_loop().run_in_executor(None, _load_upstream)
+        if _upstream is None:
+            _upstream = loaded
+    return _upstream
+
+async def fetch_all_grid_weather() -> Optional[Dict]:
+    api, client = await _upstream_api()
+    city_cell = map_to_grid(*CITY_CENTER)
+    cells = sorted({city_cell, *_grid_cells})
+    return await api.fetch_cells_weather(client, cells, city_cell, weather_provider.data)
+
+async def fetch_holidays_for_year(year: int) -> Optional[List[str]]:
+    api, client = await _upstream_api()
+    return await api.fetch_holidays_for_year(client, year)
+
+weather_provider = WeatherProvider(fetch_all_grid_weather, refresh_interval=WEATHER_REFRESH_INTERVAL)
+
+def _holiday_calendar() -> HolidayCalendar:
+    if not HOLIDAY_CACHE_FILE.exists() and HOLIDAY_CACHE_SEED.exists():
+        shutil.copy2(HOLIDAY_CACHE_SEED, HOLIDAY_CACHE_FILE)
+    return HolidayCalendar(fetch_holidays_for_year, HOLIDAY_CACHE_FILE)
+
+holiday_calendar = _holiday_calendar()
+
+_engine: Optional[PredictionEngine] = None
+
+
+def get_engine() -> PredictionEngine:
+    """인스턴스 수명 동안 쓰는 예측 엔진 (첫 요청에서 생성)
+
+    날씨/공휴일은 기다리지 않고 백그라운드로 받기 시작한다 (백엔드와 같음).
+    받기 전까지는 FALLBACK_WEATHER와 주말만 휴일로 예측한다.
+    이벤트 루프 스레드에서만 호출되고 중간에 await가 없으므로 엔진은 한 번만 만들어진다.
+    """
+    global _engine
+    if _engine is None:
+        lots, patterns = load_data()
+        _engine = PredictionEngine(lots, patterns, weather=weather_provider, holidays=holiday_calendar)
+        _grid_cells[:] = _engine.grid_cells
+        this_year = date.today().year
+        for year in (this_year, this_year + 1):
+            holiday_calendar.trigger_fetch(year)
+        weather_provider.trigger_refresh()
+    return _engine
+
+
+@app.post("/predictions", response_model=List[PredictionData])
+async def get_preds(req: PredictionRequest):
+    engine = get_engine()
+    predictions = await engine.generate_predictions(req.parking_id, req.hours_ahead)
+    return [PredictionData(**pred) for pred in predictions]
@@ -0,0 +1,134 @@
+"""
+Firebase Functions(WSGI 요청) -> ASGI 앱 호출
+- 인스턴스마다 이벤트 루프 하나를 백그라운드 스레드에서 계속 돌린다 (요청마다 새 루프를 만들지 않음)
+- 경로 앞부분으로 앱 모듈을 골라 처음 요청이 올 때만 import (쓰지 않는 경로의 무거운 라이브러리는 로드하지 않음)
+- 표준 라이브러리만 사용 (이 모듈 import 자체가 콜드 스타트 비용이 되지 않도록)
+"""
+import asyncio
+import importlib
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+Headers = List[Tuple[str, str]]
+
+# 요청 처리 제한 시간 (초), Functions 타임아웃보다 짧게
+REQUEST_TIMEOUT = 55
+
+
+class LazyRouter:
+    """경로 접두사 -> 모듈의 ASGI 앱 (모듈은 처음 쓰일 때 import)
+
+    routes: (접두사, 모듈 이름) 목록, 먼저 일치하는 항목을 사용 ("" 는 나머지 전부)
+    """
+
+    def __init__(self, routes: Sequence[Tuple[str, str]], attr: str = "app"):
+        self.routes = list(routes)
+        self.attr = attr
+        self._apps: Dict[str, Callable] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, path: str) -> Optional[str]:
+        for prefix, module_name in self.routes:
+            if not prefix or path == prefix or path.startswith(prefix + "/"):
+                return module_name
+        return None
+
+    def get_app(self, module_name: str) -> Callable:
+        app = self._apps.get(module_name)
+        if app is None:
+            with self._lock:
+                app = self._apps.get(module_name)
+                if app is None:
+                    app = getattr(importlib.import_module(module_name), self.attr)
+                    self._apps[module_name] = app
+        return app
+
+    def loaded(self) -> List[str]:
+        return list(self._apps)
+
+    async def __call__(self, scope, receive, send):
+        module_name = self.resolve(scope.get("path", "/"))
+        if module_name is None:
+            await send({"type": "http.response.start", "status": 404,
+                        "headers": [(b"content-type", b"application/json")]})
+            await send({"type": "http.response.body", "body": b'{"detail":"Not Found"}'})
+            return
+        await self.get_app(module_name)(scope, receive, send)
+
+
+# ===== 이벤트 루프 (인스턴스당 하나) =====
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="asgi-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def make_scope(method: str, path: str, query_string: bytes = b"", headers: Headers = (),
+               scheme: str = "https", client: Optional[Tuple[str, int]] = None) -> Dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": method.upper(),
+        "scheme": scheme,
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+        "client": client,
+        "server": None,
+    }
+
+
+def scope_from_request(req) -> Dict[str, Any]:
+    """Flask/Werkzeug 요청 (https_fn.Request) -> ASGI scope"""
+    return make_scope(
+        req.method,
+        req.path or "/",
+        req.query_string or b"",
+        list(req.headers.items()),
+        req.scheme,
+        (req.remote_addr, 0) if req.remote_addr else None,
+    )
+
+
+async def _run(app: Callable, scope: Dict[str, Any], body: bytes) -> Tuple[int, Headers, bytes]:
+    status = 500
+    headers: Headers = []
+    chunks: List[bytes] = []
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # 응답을 다 만든 뒤에는 연결 종료로 알림
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, headers, b"".join(chunks)
+
+
+def call_asgi(app: Callable, scope: Dict[str, Any], body: bytes = b"") -> Tuple[int, Headers, bytes]:
+    """ASGI 앱을 인스턴스 이벤트 루프에서 실행하고 (상태 코드, 헤더, 본문) 반환 (스레드에서 호출 가능)"""
+    future = asyncio.run_coroutine_threadsafe(_run(app, scope, body), get_loop())
+    return future.result(timeout=REQUEST_TIMEOUT)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Cloud Function 콜드 스타트 측정
+새 파이썬 프로세스에서 (import ~ 첫 요청 응답)까지 걸린 시간을 경로별로 재고 예산과 비교한다.
+firebase_functions import 비용은 이전/이후가 같으므로 빼고 잰다.
+
+  python bench_cold_start.py [--runs 5] [--budget-ms 800]
+"""
+import argparse
+import ast
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+FUNCTIONS_DIR = Path(__file__).resolve().parent
+
+# 이전 main.py가 모듈 import 시점에 불러오던 라이브러리
+# (pandas, requests는 requirements.txt에서 빠졌으므로 설치돼 있을 때만 비교한다)
+LEGACY_PACKAGES = ("numpy", "pandas", "jwt", "requests", "fastapi", "passlib", "pydantic", "sqlalchemy")
+LEGACY_IMPORTS = """
+import numpy, pandas, jwt, requests
+from fastapi import FastAPI
+from passlib.context import CryptContext
+from pydantic import BaseModel, EmailStr
+from sqlalchemy import create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+"""
+
+FIRST_REQUEST = """
+from asgi_bridge import LazyRouter, call_asgi, make_scope
+router = LazyRouter({routes!r})
+scope = make_scope({method!r}, {path!r}, headers=[("content-type", "application/json")])
+status, _, _ = call_asgi(router, scope, {body!r})
+assert status == {status}, f"{method} {path}: status {{status}}"
+"""
+
+# (이름, 코드 또는 (메서드, 경로, 본문, 기대 상태 코드), 예산 적용 여부)
+SCENARIOS = [
+    ("이전 main.py import", LEGACY_IMPORTS, False),
+    ("GET /parking-lots", ("GET", "/parking-lots", b"", 200), True),
+    ("POST /predictions", ("POST", "/predictions", None, 200), True),
+    ("GET /auth/register (405)", ("GET", "/auth/register", b"", 405), False),
+]
+
+
+def _routes():
+    # main.py는 firebase_functions를 import하므로 ROUTES 값만 읽어 온다
+    tree = ast.parse((FUNCTIONS_DIR / "main.py").read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'ROUTES' for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("main.py에 ROUTES가 없습니다")
+
+
+def _prediction_body() -> bytes:
+    """첫 번째 주차장에 대한 PredictionRequest 본문 (실제 데이터 로드와 엔진 생성까지 재도록)"""
+    with open(FUNCTIONS_DIR / "parkingLots.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+    lots = data.get("lots", []) if isinstance(data, dict) else data
+    return json.dumps({"parking_id": lots[0]["id"], "hours_ahead": 24}).encode("utf-8")
+
+
+RESULT_MARKER = "__elapsed_ms__"
+
+
+def measure(code: str) -> float:
+    """새 프로세스에서 code 실행 시간 (ms, 인터프리터 기동 시간 제외)"""
+    wrapped = (
+        "import time\n_t = time.perf_counter()\n"
+        + code
+        + f"\nprint('\\n{RESULT_MARKER}', (time.perf_counter() - _t) * 1000)\n"
+    )
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    out = subprocess.run([sys.executable, "-c", wrapped], cwd=FUNCTIONS_DIR, env=env,
+                         capture_output=True, text=True, check=True)
+    # 백그라운드 날씨 조회 로그가 같은 줄에 섞일 수 있어 표시가 붙은 줄만 읽는다
+    lines = [line for line in out.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+    return float(lines[-1].split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cloud Function 콜드 스타트 측정")
+    parser.add_argument('--runs', type=int, default=5, help="시나리오별 반복 횟수 (중앙값 사용)")
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv("COLD_START_BUDGET_MS", "800")),
+                        help="GET /parking-lots, POST /predictions 첫 응답 예산 (ms)")
+    args = parser.parse_args()
+
+    routes = _routes()
+    results = {}
+    print(f"⏱️ 콜드 스타트 측정 (반복 {args.runs}회, 중앙값)")
+    for name, code, _ in SCENARIOS:
+        if code is LEGACY_IMPORTS:
+            missing = [pkg for pkg in LEGACY_PACKAGES if importlib.util.find_spec(pkg) is None]
+            if missing:
+                print(f"  {name:<32} 건너뜀 (미설치: {', '.join(missing)})")
+                continue
+        if not isinstance(code, str):
+            method, path, body, status = code
+            body = _prediction_body() if body is None else body
+            code = FIRST_REQUEST.format(routes=routes, method=method, path=path, body=body, status=status)
+        times = [measure(code) for _ in range(args.runs)]
+        results[name] = statistics.median(times)
+        print(f"  {name:<32} {results[name]:8.1f} ms")
+
+    legacy = results.get(SCENARIOS[0][0])
+    over = []
+    for name, _, budgeted in SCENARIOS:
+        if budgeted:
+            if legacy:
+                print(f"  {name} 첫 응답 / 이전 import 시간: {results[name] / legacy:.0%}")
+            if results[name] > args.budget_ms:
+                over.append(name)
+    if over:
+        print(f"⚠️ 예산 {args.budget_ms:.0f} ms 초과: {', '.join(over)}")
+        sys.exit(1)
+    print(f"✅ 예산 {args.budget_ms:.0f} ms 이내")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+배포 전에 백엔드 공용 예측 코드/데이터를 functions/backend_shared/로 복사
+(Firebase는 functions 폴더만 올리므로 backend/를 직접 import할 수 없다)
+
+  python functions/sync_backend.py
+"""
+import shutil
+from pathlib import Path
+
+FUNCTIONS_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = FUNCTIONS_DIR.parent / "backend"
+SHARED_DIR = FUNCTIONS_DIR / "backend_shared"
+
+SHARED_MODULES = [
+    "prediction_engine.py",
+    "forecast_cache.py",
+    "holiday_calendar.py",
+    "hotspot_density.py",
+    "http_client.py",
+    "jitter.py",
+    "kma_grid.py",
+    "upstream_api.py",
+    "violation_counts.py",
+    "weather_provider.py",
+]
+# 모듈이 자기 폴더 기준으로 읽는 데이터
+SHARED_DATA = [
+    "hotspot_density.npy",
+    "hotspot_density.json",
+    "violation_dong_tensor.npz",
+]
+OPTIONAL_DATA = ["holiday_cache.json"]      # 백엔드 실행 중 받아 둔 공휴일 (함수의 첫 달력 값, 없으면 API에서 받음)
+# functions 폴더 바로 아래에 두는 파일 (api_common이 읽음)
+FUNCTIONS_DATA = ["violation_patterns.json"]
+
+
+def sync():
+    if SHARED_DIR.exists():
+        shutil.rmtree(SHARED_DIR)
+    SHARED_DIR.mkdir()
+    for name in SHARED_MODULES + SHARED_DATA:
+        shutil.copy2(BACKEND_DIR / name, SHARED_DIR / name)
+    for name in OPTIONAL_DATA:
+        if (BACKEND_DIR / name).exists():
+            shutil.copy2(BACKEND_DIR / name, SHARED_DIR / name)
+    for name in FUNCTIONS_DATA:
+        shutil.copy2(BACKEND_DIR / name, FUNCTIONS_DIR / name)
+    print(f"✅ 백엔드 공용 파일 {len(list(SHARED_DIR.iterdir()))}개 -> {SHARED_DIR.relative_to(FUNCTIONS_DIR.parent)}")
+
+
+if __name__ == "__main__":
+    sync()